@@ -1,19 +1,54 @@
 import os
+from datetime import date
 
 from RPA.Robocorp.WorkItems import WorkItems
 
+from extractors.apnews import DEFAULT_SIMILARITY_THRESHOLD
+
 
 class RCCWortItems:
 
-    def __init__(self):
-        if os.getenv('ENVIRONMENT') == 'PROD':
+    def __init__(self, payload: dict | None = None):
+        if payload is None and os.getenv('ENVIRONMENT') == 'PROD':
             work_items = WorkItems()
             work_items.get_input_work_item()
-            work_item = work_items.get_work_item_payload()
-            self.search_phrase = work_item["search_phrase"]
-            self.no_of_months = work_item.get("no_of_months", 1)
-            self.category = work_item.get("category")
+            payload = work_items.get_work_item_payload()
+
+        if payload is not None:
+            self.payload = payload
+            self.search_phrase = payload["search_phrase"]
+            self.no_of_months = payload.get("no_of_months", 1)
+            self.category = payload.get("category")
+            self.categories = payload.get("categories") or ([self.category] if self.category else [])
+            self.similarity_threshold = payload.get("similarity_threshold", DEFAULT_SIMILARITY_THRESHOLD)
+            self.fetch_articles = payload.get("fetch_articles", False)
+            self.page_cache_ttl = payload.get("page_cache_ttl", 900)
+            self.dataset_dir = payload.get("dataset_dir")
+            self.shard_days = payload.get("shard_days", 30)
+            self.till_date = date.fromisoformat(payload["till_date"]) if payload.get("till_date") else None
+            self.from_date = date.fromisoformat(payload["from_date"]) if payload.get("from_date") else None
+            self.image_width = payload.get("image_width")
+            self.image_format = payload.get("image_format")
+            self.image_quality = payload.get("image_quality", 80)
+            self.request_interval = payload.get("request_interval", 0.5)
         else:
             self.search_phrase = "ICC"
             self.no_of_months = 1
             self.category = "Stories"
+            self.categories = [self.category]
+            self.similarity_threshold = DEFAULT_SIMILARITY_THRESHOLD
+            self.fetch_articles = False
+            self.page_cache_ttl = 900
+            self.dataset_dir = None
+            self.shard_days = 30
+            self.till_date = None
+            self.from_date = None
+            self.image_width = None
+            self.image_format = None
+            self.image_quality = 80
+            self.request_interval = 0.5
+            self.payload = {
+                "search_phrase": self.search_phrase,
+                "no_of_months": self.no_of_months,
+                "category": self.category,
+            }
@@ -1,3 +1,7 @@
 from .decorator import retry
+from .timeouts import TimeoutManager
 from .wrapper import BrowserWrapper
-from .constants import AMOUNT_REGEX
+from .constants import AMOUNT_REGEX, CACHE_DIR, REQUEST_HEADERS, EXCEL_CELL_LIMIT
+from .throttle import HostScheduler
+from .cache import PageCache
+from .locator import LocatorEngine, Locator, xpath_to_css
@@ -1,4 +1,11 @@
 from .locators import ApNewsLocators
 from .models import APNewsItem
-from .utils import parse_date, reached_date_limit, get_till_date, download_by_image_url, make_archive
+from .utils import parse_date, reached_date_limit, get_till_date, make_archive, \
+    sniff_image_type, build_page_url, find_cutoff_page, find_start_page, plan_date_shards, \
+    UnsortedResultsError
+from .dedup import deduplicate_items, DEFAULT_SIMILARITY_THRESHOLD
+from .articles import ArticleFetcher, parse_article
+from .images import ImageDownloader, IMAGE_SOURCES_SCRIPT, parse_srcset, select_rendition, normalize_image_format
+from .dataset import write_items_to_dataset, open_dataset
+from .sharding import shard_payloads, merge_shard_items
 from .process import ApNews
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+
+import requests
+
+from extractors import CACHE_DIR, HostScheduler
+from logging_config import logger
+
+# Class tokens of the article body and byline containers on AP News article pages
+BODY_CLASS_REGEX = re.compile(r'(?:^|\s)RichTextStoryBody(?:\s|$)')
+BYLINE_CLASS_REGEX = re.compile(r'(?:^|\s)Page-authors(?:\s|$)')
+
+_WHITESPACE_REGEX = re.compile(r'\s+')
+_BYLINE_PREFIX_REGEX = re.compile(r'^by\s+', re.IGNORECASE)
+
+
+class ArticleParser(HTMLParser):
+    """
+    Streaming parser collecting the body paragraphs and byline of an AP News article page.
+
+    Attributes:
+        paragraphs (list[str]): Text of each paragraph found in the article body.
+        byline (list[str]): Text fragments found in the byline container.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self.byline = []
+        self._body_depth = 0
+        self._byline_depth = 0
+        self._paragraph = None
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag == 'div':
+            class_name = dict(attrs).get('class') or ''
+            if self._body_depth or BODY_CLASS_REGEX.search(class_name):
+                self._body_depth += 1
+            if self._byline_depth or BYLINE_CLASS_REGEX.search(class_name):
+                self._byline_depth += 1
+        elif tag == 'p' and self._body_depth:
+            self._paragraph = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'div':
+            self._body_depth = max(self._body_depth - 1, 0)
+            self._byline_depth = max(self._byline_depth - 1, 0)
+        elif tag == 'p' and self._paragraph is not None:
+            text = _WHITESPACE_REGEX.sub(' ', ''.join(self._paragraph)).strip()
+            if text:
+                self.paragraphs.append(text)
+            self._paragraph = None
+
+    def handle_data(self, data: str) -> None:
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+        elif self._byline_depth:
+            self.byline.append(data)
+
+
+def parse_article(html: str) -> dict:
+    """
+    Extract the body text and byline from an AP News article page.
+
+    Args:
+    - html (str): The HTML of the article page.
+
+    Returns:
+    - dict: The article `body` and `byline`, each None if not found.
+    """
+    parser = ArticleParser()
+    parser.feed(html)
+    parser.close()
+    byline = _WHITESPACE_REGEX.sub(' ', ' '.join(parser.byline)).strip()
+    return {
+        'body': '\n\n'.join(parser.paragraphs) or None,
+        'byline': _BYLINE_PREFIX_REGEX.sub('', byline) or None,
+    }
+
+
+class ArticleFetcher:
+    """
+    Fetches and parses article pages concurrently through a host scheduler, with an on-disk cache.
+
+    Attributes:
+        cache_dir (str): Directory holding one parsed article per URL.
+        max_workers (int): The maximum number of articles fetched at once.
+        timeout (float): The timeout of a single request in seconds.
+        scheduler (HostScheduler): Adapts the concurrency and pace of requests to each host.
+        cache_hits (int): Number of articles served from the cache.
+    """
+
+    def __init__(
+            self, cache_dir: str = f'{CACHE_DIR}/articles', max_workers: int = 8,
+            scheduler: HostScheduler | None = None, timeout: float = 30
+    ) -> None:
+        """
+        Initializes the fetcher and creates its cache directory.
+
+        Args:
+            cache_dir (str): Directory holding one parsed article per URL.
+            max_workers (int): The maximum number of articles fetched at once.
+            scheduler (HostScheduler | None): The scheduler shared with the other fetchers, a new one if None.
+            timeout (float): The timeout of a single request in seconds.
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.scheduler = scheduler or HostScheduler()
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, url: str) -> str:
+        """
+        Get the cache file of an article URL.
+
+        Args:
+            url (str): The article URL.
+
+        Returns:
+            str: The path of the cache file.
+        """
+        return os.path.join(self.cache_dir, f'{hashlib.sha1(url.encode()).hexdigest()}.json')
+
+    def read_cache(self, url: str) -> dict | None:
+        """
+        Read a previously fetched article from the cache.
+
+        Args:
+            url (str): The article URL.
+
+        Returns:
+            dict | None: The cached article, or None if it was never fetched.
+        """
+        try:
+            with open(self.cache_path(url), encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def write_cache(self, url: str, article: dict) -> None:
+        """
+        Store a parsed article in the cache.
+
+        Args:
+            url (str): The article URL.
+            article (dict): The parsed article.
+        """
+        path = self.cache_path(url)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(article, file)
+        os.replace(temp_path, path)
+
+    def fetch(self, url: str) -> dict | None:
+        """
+        Fetch and parse a single article, using the cache when possible.
+
+        Args:
+            url (str): The article URL.
+
+        Returns:
+            dict | None: The parsed article, or None if it could not be fetched.
+        """
+        article = self.read_cache(url)
+        if article is not None:
+            with self._lock:
+                self.cache_hits += 1
+            return article
+
+        try:
+            response = self.scheduler.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch article '{url}'. Error: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"Fetching article '{url}' returned status {response.status_code}")
+            return None
+
+        article = parse_article(response.text)
+        self.write_cache(url, article)
+        return article
+
+    def fetch_all(self, urls: list[str]) -> dict[str, dict]:
+        """
+        Fetch and parse several articles concurrently.
+
+        Args:
+            urls (list[str]): The article URLs, duplicates and empty values are ignored.
+
+        Returns:
+            dict[str, dict]: The parsed articles keyed by URL, without the ones that failed.
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            articles = executor.map(self.fetch, unique_urls)
+            return {url: article for url, article in zip(unique_urls, articles) if article}
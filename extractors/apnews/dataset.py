@@ -0,0 +1,154 @@
+import json
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from extractors.apnews.models import APNewsItem
+
+# Columns stored in the parquet files, computed fields included
+DATASET_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("title", pa.string()),
+    ("description", pa.string()),
+    ("image", pa.string()),
+    ("image_name", pa.string()),
+    ("url", pa.string()),
+    ("categories", pa.list_(pa.string())),
+    ("byline", pa.string()),
+    ("body", pa.string()),
+    ("containing_amount", pa.bool_()),
+    ("count_of_search_phrase", pa.int32()),
+    ("run_id", pa.string()),
+    ("extracted_at", pa.timestamp("ms", tz="UTC")),
+])
+
+# Columns encoded in the hive style partition directories
+PARTITION_SCHEMA = pa.schema([
+    ("search_phrase", pa.string()),
+    ("date", pa.date32()),
+])
+
+# Directory name of the partition holding items without a date
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Directory of the run manifests, listing the files of each committed run
+MANIFEST_DIR = "_runs"
+
+
+def partition_path(search_phrase: str, news_date: str | None) -> str:
+    """
+    Build the relative directory of a search phrase and date partition.
+
+    Args:
+    - search_phrase (str): The search phrase of the items.
+    - news_date (str | None): The ISO publication date of the items.
+
+    Returns:
+    - str: The hive style partition directory.
+    """
+    return os.path.join(
+        f"search_phrase={quote(search_phrase, safe='')}",
+        f"date={news_date or NULL_PARTITION}",
+    )
+
+
+def write_items_to_dataset(items: list[APNewsItem], root: str, run_id: str | None = None) -> list[str]:
+    """
+    Append news items to a parquet dataset partitioned by search phrase and publication date.
+
+    Each partition touched by the run gets one new file named after the run. All files are
+    written under hidden temporary names before any is renamed into place, and the run is only
+    committed once its manifest is written under `MANIFEST_DIR`. `open_dataset` reads committed
+    runs only, so a run that fails halfway leaves no rows behind for its rerun to duplicate.
+
+    Args:
+    - items (list[APNewsItem]): The news items to append.
+    - root (str): The root directory of the dataset.
+    - run_id (str | None): Identifier of the run, a random one if None.
+
+    Returns:
+    - list[str]: The paths of the files written.
+    """
+    run_id = run_id or uuid.uuid4().hex
+    extracted_at = datetime.now(timezone.utc).replace(microsecond=0)
+    partitions = defaultdict(list)
+    for item in items:
+        partitions[(item.search_phrase, item.date)].append(item.model_dump())
+
+    files = []
+    try:
+        for (search_phrase, news_date), rows in partitions.items():
+            directory = os.path.join(root, partition_path(search_phrase, news_date))
+            os.makedirs(directory, exist_ok=True)
+            table = pa.Table.from_pylist(
+                [{**row, "run_id": run_id, "extracted_at": extracted_at} for row in rows],
+                schema=DATASET_SCHEMA,
+            )
+            temp_path = os.path.join(directory, f".part-{run_id}.parquet.tmp")
+            files.append((temp_path, os.path.join(directory, f"part-{run_id}.parquet")))
+            pq.write_table(table, temp_path)
+    except Exception:
+        for temp_path, _ in files:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+
+    for temp_path, path in files:
+        os.replace(temp_path, path)
+
+    manifest_dir = os.path.join(root, MANIFEST_DIR)
+    os.makedirs(manifest_dir, exist_ok=True)
+    manifest_path = os.path.join(manifest_dir, f"{run_id}.json")
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as file:
+        json.dump({
+            "run_id": run_id,
+            "extracted_at": extracted_at.isoformat(),
+            "files": [os.path.relpath(path, root) for _, path in files],
+        }, file)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return [path for _, path in files]
+
+
+def committed_files(root: str) -> list[str]:
+    """
+    List the files of the runs whose manifest was written.
+
+    Args:
+    - root (str): The root directory of the dataset.
+
+    Returns:
+    - list[str]: The paths of the committed parquet files.
+    """
+    manifest_dir = os.path.join(root, MANIFEST_DIR)
+    if not os.path.isdir(manifest_dir):
+        return []
+    paths = []
+    for name in sorted(os.listdir(manifest_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(manifest_dir, name), encoding="utf-8") as file:
+            paths.extend(os.path.join(root, path) for path in json.load(file)["files"])
+    return paths
+
+
+def open_dataset(root: str) -> ds.Dataset:
+    """
+    Open the committed runs of the parquet dataset with its typed partition columns.
+
+    Args:
+    - root (str): The root directory of the dataset.
+
+    Returns:
+    - ds.Dataset: The dataset, with `search_phrase` and `date` read from the partition directories.
+    """
+    partitioning = ds.HivePartitioning(PARTITION_SCHEMA, null_fallback=NULL_PARTITION)
+    return ds.dataset(
+        committed_files(root), schema=pa.unify_schemas([DATASET_SCHEMA, PARTITION_SCHEMA]),
+        format="parquet", partitioning=partitioning, partition_base_dir=root,
+    )
@@ -0,0 +1,202 @@
+import hashlib
+import random
+import re
+from urllib.parse import urlparse, parse_qs
+
+from extractors.apnews.models import APNewsItem
+
+# Default estimated Jaccard similarity above which two items are treated as the same story
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+# Number of consecutive words per shingle
+SHINGLE_SIZE = 3
+
+# Number of MinHash values per fingerprint, split into LSH bands
+SIGNATURE_SIZE = 64
+
+# Minimum probability that a pair exactly at the similarity threshold shares an LSH band
+CANDIDATE_RECALL = 0.99
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_REGEX = re.compile(r"\w+")
+_random = random.Random(SIGNATURE_SIZE)
+_PERMUTATIONS = [
+    (_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME))
+    for _ in range(SIGNATURE_SIZE)
+]
+
+
+def url_key(url: str | None) -> str | None:
+    """
+    Normalize an article URL so that tracking parameters and fragments do not hide duplicates.
+
+    Args:
+    - url (str | None): The article URL.
+
+    Returns:
+    - str | None: The normalized URL, or None if there is no URL.
+    """
+    if not url:
+        return None
+    parsed = urlparse(url)
+    return f"{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+
+def image_key(url: str | None) -> str | None:
+    """
+    Normalize an image URL to the underlying asset, ignoring the resize and crop parameters
+    that the image proxy adds for each rendition.
+
+    Args:
+    - url (str | None): The image URL.
+
+    Returns:
+    - str | None: The normalized image URL, or None if there is no URL.
+    """
+    if not url:
+        return None
+    source = parse_qs(urlparse(url).query).get("url")
+    if source:
+        url = source[0]
+    return url_key(url)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """
+    Hash the overlapping word shingles of a text.
+
+    Args:
+    - text (str): The text to shingle.
+    - size (int): The number of words per shingle.
+
+    Returns:
+    - set[int]: The 64 bit hashes of the shingles.
+    """
+    words = _WORD_REGEX.findall(text.lower())
+    if not words:
+        return set()
+    grams = [" ".join(words[index:index + size]) for index in range(max(len(words) - size + 1, 1))]
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "big")
+        for gram in grams
+    }
+
+
+def fingerprint(title: str | None, description: str | None) -> tuple[int, ...] | None:
+    """
+    Compute the MinHash fingerprint of a news item's title and description.
+
+    Args:
+    - title (str | None): The title of the news item.
+    - description (str | None): The description of the news item.
+
+    Returns:
+    - tuple[int, ...] | None: The MinHash signature, or None if there is no text.
+    """
+    hashes = shingles(f"{title or ''} {description or ''}")
+    if not hashes:
+        return None
+    return tuple(
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+    """
+    Estimate the Jaccard similarity of two fingerprints.
+
+    Args:
+    - first (tuple[int, ...]): The first MinHash signature.
+    - second (tuple[int, ...]): The second MinHash signature.
+
+    Returns:
+    - float: The fraction of matching signature values.
+    """
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+def band_rows(threshold: float) -> int:
+    """
+    Choose the number of signature values per LSH band for a similarity threshold.
+
+    A pair with similarity `s` shares at least one of `b` bands of `r` rows with probability
+    `1 - (1 - s^r)^b`. The widest band keeping that probability at `CANDIDATE_RECALL` for a pair
+    at the threshold is chosen, so lower thresholds get narrower bands and more candidates.
+
+    Args:
+    - threshold (float): The estimated Jaccard similarity at which items are duplicates.
+
+    Returns:
+    - int: The number of rows per band, a divisor of `SIGNATURE_SIZE`.
+    """
+    rows = 1
+    for candidate in range(2, SIGNATURE_SIZE + 1):
+        if SIGNATURE_SIZE % candidate:
+            continue
+        bands = SIGNATURE_SIZE // candidate
+        if 1 - (1 - threshold ** candidate) ** bands >= CANDIDATE_RECALL:
+            rows = candidate
+    return rows
+
+
+def deduplicate_items(
+        items: list[APNewsItem], threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+) -> tuple[list[APNewsItem], int]:
+    """
+    Collapse repeated stories, keeping the first occurrence of each and merging in the
+    categories of its duplicates.
+
+    An item is a duplicate when it shares its article URL or image asset with a kept item,
+    or when its title and description fingerprint is at least `threshold` similar to one.
+    Candidates are found through LSH bands sized for the threshold by `band_rows`, so only
+    items sharing a band are compared.
+
+    Args:
+    - items (list[APNewsItem]): The extracted news items, in result order.
+    - threshold (float): The estimated Jaccard similarity at which items are duplicates.
+
+    Returns:
+    - tuple: The deduplicated items and the number of duplicates removed.
+    """
+    kept = []
+    signatures = []
+    seen_keys = {}
+    buckets = {}
+    duplicates = 0
+    rows = band_rows(threshold)
+
+    for item in items:
+        keys = {
+            key for key in (("url", url_key(item.url)), ("image", image_key(item.image)))
+            if key[1]
+        }
+        original = next((seen_keys[key] for key in keys if key in seen_keys), None)
+
+        signature = fingerprint(item.title, item.description) if original is None else None
+        bands = []
+        if signature:
+            bands = [
+                (start, signature[start:start + rows])
+                for start in range(0, SIGNATURE_SIZE, rows)
+            ]
+            candidates = sorted({index for band in bands for index in buckets.get(band, ())})
+            original = next(
+                (index for index in candidates if similarity(signature, signatures[index]) >= threshold), None
+            )
+
+        if original is not None:
+            duplicates += 1
+            for category in item.categories:
+                if category not in kept[original].categories:
+                    kept[original].categories.append(category)
+            continue
+
+        for band in bands:
+            buckets.setdefault(band, []).append(len(kept))
+        for key in keys:
+            seen_keys[key] = len(kept)
+        signatures.append(signature)
+        kept.append(item)
+
+    return kept, duplicates
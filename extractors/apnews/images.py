@@ -0,0 +1,307 @@
+import io
+import mimetypes
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from PIL import Image
+
+from extractors import HostScheduler
+from extractors.apnews.utils import generate_filename, sniff_image_type
+from logging_config import logger
+
+# Image types a rendition may be selected in; AVIF is left out as Pillow cannot re-encode it
+ACCEPTED_IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/webp', 'image/gif')
+
+# Pillow formats images can be re-encoded to, with their file extension
+TARGET_FORMATS = {'jpeg': 'jpg', 'webp': 'webp', 'png': 'png'}
+
+# Collects the candidates of an image and of its enclosing picture element in one round trip
+IMAGE_SOURCES_SCRIPT = """
+const image = arguments[0];
+const picture = image.closest('picture');
+const sources = picture ? Array.from(picture.querySelectorAll('source')) : [];
+return {
+    base: document.baseURI,
+    src: image.getAttribute('src') || image.getAttribute('data-src'),
+    srcset: image.getAttribute('srcset') || image.getAttribute('data-srcset'),
+    sources: sources.map(source => ({
+        srcset: source.getAttribute('srcset') || source.getAttribute('data-srcset'),
+        type: source.getAttribute('type'),
+    })),
+};
+"""
+
+_SRCSET_URL_REGEX = re.compile(r'[\s,]*(\S+)')
+_WIDTH_DESCRIPTOR_REGEX = re.compile(r'^(\d+)w$')
+
+
+def parse_srcset(srcset: str | None) -> list[tuple[str, int | None]]:
+    """
+    Parse the candidates of a `srcset` attribute.
+
+    URLs may contain commas, so each URL runs up to the next whitespace and its descriptors up
+    to the next comma, as browsers parse it.
+
+    Args:
+    - srcset (str | None): The attribute value.
+
+    Returns:
+    - list[tuple[str, int | None]]: The URL of each candidate and its width descriptor, None
+      for density descriptors or none.
+    """
+    candidates = []
+    position = 0
+    while srcset and position < len(srcset):
+        match = _SRCSET_URL_REGEX.match(srcset, position)
+        if not match:
+            break
+        url, position = match.group(1), match.end()
+        descriptors = ''
+        if url.endswith(','):
+            url = url.rstrip(',')
+        else:
+            end = srcset.find(',', position)
+            end = len(srcset) if end == -1 else end
+            descriptors, position = srcset[position:end], end + 1
+        width = next(
+            (int(match.group(1)) for match in map(_WIDTH_DESCRIPTOR_REGEX.match, descriptors.split()) if match),
+            None
+        )
+        candidates.append((url, width))
+    return candidates
+
+
+def select_rendition(sources: dict, min_width: int) -> str | None:
+    """
+    Select the smallest image rendition at least `min_width` pixels wide.
+
+    Candidates come from the `<source>` elements of the enclosing picture, in document order,
+    then from the image's own `srcset`. When no candidate is wide enough the widest one is
+    taken, and when none has a width descriptor the image `src` is kept.
+
+    Args:
+    - sources (dict): The `base` URI, `src`, `srcset` and `sources` collected by `IMAGE_SOURCES_SCRIPT`.
+    - min_width (int): The minimum width in pixels.
+
+    Returns:
+    - str | None: The absolute URL of the selected rendition, or None if the image has no URL.
+    """
+    candidates = []
+    for source in sources.get('sources') or []:
+        if source.get('type') and source['type'] not in ACCEPTED_IMAGE_TYPES:
+            continue
+        candidates.extend(parse_srcset(source.get('srcset')))
+    candidates.extend(parse_srcset(sources.get('srcset')))
+    candidates = [(url, width) for url, width in candidates if width]
+
+    if candidates:
+        wide_enough = [candidate for candidate in candidates if candidate[1] >= min_width]
+        if wide_enough:
+            url = min(wide_enough, key=lambda candidate: candidate[1])[0]
+        else:
+            url = max(candidates, key=lambda candidate: candidate[1])[0]
+    else:
+        url = sources.get('src')
+    return urljoin(sources.get('base') or '', url) if url else None
+
+
+def normalize_image_format(image_format: str | None) -> str | None:
+    """
+    Validate a target image format.
+
+    Args:
+    - image_format (str | None): The format to re-encode images to, in any case.
+
+    Returns:
+    - str | None: The lower case format, or None to keep the downloaded bytes.
+
+    Raises:
+    - ValueError: If the format is not one of `TARGET_FORMATS`.
+    """
+    if not image_format:
+        return None
+    if image_format.lower() not in TARGET_FORMATS:
+        raise ValueError(f"Unsupported image format '{image_format}', expected one of {list(TARGET_FORMATS)}")
+    return image_format.lower()
+
+
+class ImageDownloader:
+    """
+    Downloads images through a host scheduler and saves them under their detected format,
+    optionally re-encoding them in a separate worker pool.
+
+    Pillow releases the GIL while decoding and encoding, so re-encoding runs in threads
+    alongside the downloads still in flight.
+
+    Attributes:
+        output_dir (str): Directory the images are saved in.
+        scheduler (HostScheduler): Adapts the concurrency and pace of requests to each host.
+        image_format (str | None): Pillow format to re-encode to, None to keep the original bytes.
+        quality (int): The encoder quality when re-encoding.
+        max_width (int | None): Width that larger images are scaled down to when re-encoding.
+        max_workers (int): The maximum number of images downloaded at once.
+        encode_workers (int): The number of images re-encoded at once.
+        timeout (float): The timeout of a single request in seconds.
+        downloaded (int): Number of images downloaded.
+        reencoded (int): Number of images saved re-encoded.
+        bytes_transferred (int): Bytes of image content downloaded.
+        bytes_written (int): Bytes of image files saved.
+    """
+
+    def __init__(
+            self, output_dir: str, scheduler: HostScheduler | None = None, image_format: str | None = None,
+            quality: int = 80, max_width: int | None = None, max_workers: int = 8,
+            encode_workers: int | None = None, timeout: float = 30
+    ) -> None:
+        """
+        Initializes the downloader and creates its output directory.
+
+        Args:
+            output_dir (str): Directory the images are saved in.
+            scheduler (HostScheduler | None): The scheduler shared with the other fetchers, a new one if None.
+            image_format (str | None): One of `TARGET_FORMATS` to re-encode to, None to keep the original bytes.
+            quality (int): The encoder quality when re-encoding.
+            max_width (int | None): Width that larger images are scaled down to when re-encoding.
+            max_workers (int): The maximum number of images downloaded at once.
+            encode_workers (int | None): The number of images re-encoded at once, one per CPU if None.
+            timeout (float): The timeout of a single request in seconds.
+        """
+        self.output_dir = output_dir
+        self.scheduler = scheduler or HostScheduler()
+        self.image_format = normalize_image_format(image_format)
+        self.quality = quality
+        self.max_width = max_width
+        self.max_workers = max_workers
+        self.encode_workers = encode_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.downloaded = 0
+        self.reencoded = 0
+        self.bytes_transferred = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def fetch(self, url: str | None) -> tuple[bytes, str] | None:
+        """
+        Download a single image and detect its format.
+
+        Args:
+            url (str | None): The image URL.
+
+        Returns:
+            tuple[bytes, str] | None: The image content and file extension, or None if the download fails.
+        """
+        if not url:
+            return None
+        try:
+            response = self.scheduler.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error(f"Failed to download image. Error: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f'Image {url} returned status {response.status_code}')
+            return None
+
+        data = response.content
+        with self._lock:
+            self.downloaded += 1
+            self.bytes_transferred += len(data)
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        extension = sniff_image_type(data) or (mimetypes.guess_extension(content_type) or '.bin').lstrip('.')
+        return data, extension
+
+    def reencode(self, data: bytes, extension: str) -> tuple[bytes, str]:
+        """
+        Re-encode an image to the target format and quality, scaling it down to `max_width`.
+
+        Animated and undecodable images are kept as they are, as is an image already in the
+        target format that would not get any smaller.
+
+        Args:
+            data (bytes): The image content.
+            extension (str): The file extension of its format.
+
+        Returns:
+            tuple[bytes, str]: The content and file extension to save.
+        """
+        target_extension = TARGET_FORMATS[self.image_format]
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                if getattr(image, 'is_animated', False):
+                    return data, extension
+                if self.max_width and image.width > self.max_width:
+                    image.thumbnail((self.max_width, image.height))
+                if self.image_format == 'jpeg' and image.mode not in ('RGB', 'L'):
+                    image = image.convert('RGB')
+                buffer = io.BytesIO()
+                image.save(buffer, format=self.image_format.upper(), quality=self.quality, optimize=True)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Failed to re-encode image, keeping the original. Error: {e}')
+            return data, extension
+
+        encoded = buffer.getvalue()
+        if target_extension == extension and len(encoded) >= len(data):
+            return data, extension
+        with self._lock:
+            self.reencoded += 1
+        return encoded, target_extension
+
+    def save(self, data: bytes, extension: str) -> str | None:
+        """
+        Save an image, re-encoding it first if a target format is set.
+
+        Args:
+            data (bytes): The image content.
+            extension (str): The file extension of its format.
+
+        Returns:
+            str | None: The path of the saved image, or None if it could not be written.
+        """
+        if self.image_format:
+            data, extension = self.reencode(data, extension)
+        file_name = os.path.join(self.output_dir, generate_filename(extension))
+        try:
+            with open(file_name, 'wb') as file:
+                file.write(data)
+        except OSError as e:
+            logger.error(f"Failed to save image. Error: {e}")
+            return None
+        with self._lock:
+            self.bytes_written += len(data)
+        return file_name
+
+    def download_all(self, urls: list[str | None]) -> list[str | None]:
+        """
+        Download and save images, re-encoding each while the next ones are downloading.
+
+        Args:
+            urls (list[str | None]): The image URLs.
+
+        Returns:
+            list[str | None]: The path of each saved image, None where there was no image or it failed.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as downloads, \
+                ThreadPoolExecutor(max_workers=self.encode_workers) as encoders:
+            saved = [
+                encoders.submit(self.save, *content) if content else None
+                for content in downloads.map(self.fetch, urls)
+            ]
+            return [future.result() if future else None for future in saved]
+
+    def metrics(self) -> dict:
+        """
+        Report the images downloaded and re-encoded and the bytes transferred and written.
+
+        Returns:
+            dict: The counters of the downloader.
+        """
+        return {
+            'downloaded': self.downloaded,
+            'reencoded': self.reencoded,
+            'bytes_transferred': self.bytes_transferred,
+            'bytes_written': self.bytes_written,
+        }
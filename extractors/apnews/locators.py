@@ -15,11 +15,15 @@ class ApNewsLocators:
         SORT_BY_VALUE_LOCATOR (str): Value to select from the sort by dropdown.
         RESULTS_LOCATOR (str): Locator for the search results items.
         TITLE_LOCATOR (str): Locator for the title of a search result item.
+        LINK_LOCATOR (str): Locator for the article link of a search result item.
         DESCRIPTION_LOCATOR (str): Locator for the description of a search result item.
         DATE_NOW_LOCATOR (str): Locator for the "now" timestamp in a search result item.
         DATE_LOCATOR (str): Locator for the date timestamp in a search result item.
         IMAGE_LOCATOR (str): Locator for the image in a search result item.
         PAGE_COUNT_LOCATOR (str): Locator for the pagination page count.
+        PAGE_QUERY_PARAM (str): Query parameter holding the results page number.
+        HEALTH_CHECK_LOCATORS (tuple): Locators validated against the first results page.
+        REQUIRED_LOCATORS (tuple): Locators without which the extraction cannot run.
     """
 
     # Locator for the close button on the donation popup
@@ -59,6 +63,9 @@ class ApNewsLocators:
     # Locator for the title of a search result item
     TITLE_LOCATOR = './/div[@class="PagePromo-title"]/a[@class="Link "]/span'
 
+    # Locator for the article link of a search result item
+    LINK_LOCATOR = './/div[@class="PagePromo-title"]/a'
+
     # Locator for the description of a search result item
     DESCRIPTION_LOCATOR = './/div[@class="PagePromo-description"]/a[@class="Link "]/span'
 
@@ -79,3 +86,22 @@ class ApNewsLocators:
 
     # Locator for No Result Found
     NO_RESULT_FOUND = '//div[@class="SearchResultsModule-noResults"]'
+
+    # Query parameter holding the results page number in the search URL
+    PAGE_QUERY_PARAM = "p"
+
+    # Locators validated against the first results page before extracting
+    HEALTH_CHECK_LOCATORS = (
+        'RESULTS_LOCATOR',
+        'TITLE_LOCATOR',
+        'LINK_LOCATOR',
+        'DESCRIPTION_LOCATOR',
+        'DATE_NOW_LOCATOR',
+        'DATE_LOCATOR',
+        'IMAGE_LOCATOR',
+        'PAGE_COUNT_LOCATOR',
+        'NO_RESULT_FOUND',
+    )
+
+    # Locators without which the extraction cannot run
+    REQUIRED_LOCATORS = ('RESULTS_LOCATOR', 'TITLE_LOCATOR', 'LINK_LOCATOR')
@@ -15,8 +15,12 @@ class APNewsItem(BaseModel):
         description (str): Description of the news item.
         date (Optional[str]): Publication date of the news item.
         image (Optional[str]): URL of the news item's image.
+        url (Optional[str]): URL of the news article.
         search_phrase (str): Search phrase used to find the news item.
+        categories (list[str]): Categories the news item was found under.
         image_name (str | None): image name of the news item.
+        body (Optional[str]): Body text of the full article, if it was fetched.
+        byline (Optional[str]): Byline of the full article, if it was fetched.
     """
 
     id: int
@@ -24,25 +28,29 @@ class APNewsItem(BaseModel):
     description: Optional[str]
     date: Optional[str]
     image: Optional[str]
+    url: Optional[str] = None
     search_phrase: str
+    categories: list[str] = []
     image_name: Optional[str]
+    body: Optional[str] = None
+    byline: Optional[str] = None
 
     @computed_field
     def containing_amount(self) -> bool:
         """
-        Check if the title or description contains an amount.
+        Check if the title, description or article body contains an amount.
 
         Returns:
             bool: True if an amount is found, False otherwise.
         """
-        return contains_amount(self.title, self.description)
+        return contains_amount(self.title, self.description, self.body)
 
     @computed_field
     def count_of_search_phrase(self) -> int:
         """
-        Count the occurrences of the search phrase in the title and description.
+        Count the occurrences of the search phrase in the title, description and article body.
 
         Returns:
             int: The number of times the search phrase appears.
         """
-        return count_search_phrase(self.title, self.description, self.search_phrase)
+        return count_search_phrase(self.title, self.description, self.search_phrase, self.body)
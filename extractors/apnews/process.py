@@ -1,15 +1,21 @@
+import json
 import os.path
+from datetime import date
 
-from selenium.common import NoSuchElementException, StaleElementReferenceException
-from selenium.webdriver.common.by import By
+from selenium.common import StaleElementReferenceException
 from selenium.webdriver.remote.webelement import WebElement
 
-from extractors.apnews import ApNewsLocators, APNewsItem, parse_date, reached_date_limit, get_till_date, download_by_image_url, make_archive
-from extractors import BrowserWrapper, retry
+from extractors.apnews import ApNewsLocators, APNewsItem, parse_date, reached_date_limit, get_till_date, make_archive, build_page_url, find_cutoff_page, find_start_page, \
+    deduplicate_items, DEFAULT_SIMILARITY_THRESHOLD, ArticleFetcher, write_items_to_dataset, ImageDownloader, \
+    IMAGE_SOURCES_SCRIPT, select_rendition, normalize_image_format, UnsortedResultsError
+from extractors import BrowserWrapper, HostScheduler, PageCache, LocatorEngine, retry, EXCEL_CELL_LIMIT
 
 
 from logging_config import logger
 
+# Most results pages scanned when the results turn out not to be sorted newest first
+UNSORTED_SCAN_PAGES = 25
+
 
 class ApNews(BrowserWrapper, ApNewsLocators):
     """
@@ -18,29 +24,87 @@ class ApNews(BrowserWrapper, ApNewsLocators):
     Attributes:
     - base_url (str): The base URL of the AP News website.
     - search_phrase (str): The phrase to search for in the news articles.
-    - category (str): The category of news articles to filter by.
+    - category (str | None): The category filter currently applied to the search results.
+    - categories (list[str]): The categories of news articles to sweep in a single search session.
     - news_count (int): Counter for the number of news articles extracted.
     - output_dir (str): Directory to save the extracted data.
     - results (list): List to store the extracted news items.
     - till_date (datetime): Date limit for extracting news articles.
+    - from_date (date | None): Newest publication date to extract, None for no upper limit.
+    - search_url (str | None): URL of the sorted search results, before any category filter.
+    - results_url (str | None): URL of the sorted and filtered search results.
+    - items_by_url (dict): Extracted news items keyed by article URL, to share them across categories.
+    - shared_count (int): Number of articles found again under another category.
+    - similarity_threshold (float): Similarity at which two news items are treated as the same story.
+    - duplicate_count (int): Number of duplicate news items removed.
+    - fetch_articles (bool): Whether to fetch the full article of each news item.
+    - scheduler (HostScheduler): Adapts the concurrency of page loads, article fetches and image downloads.
+    - article_fetcher (ArticleFetcher | None): Fetches and caches the full articles, None unless fetch_articles.
+    - page_cache (PageCache): Short-lived cache of the news details of each results page.
+    - dataset_dir (str | None): Root of the parquet dataset the items are appended to, if any.
+    - locator_engine (LocatorEngine): Compiles the locators into CSS fast paths with XPath fallbacks.
+    - image_width (int | None): Minimum width of the image rendition to download, None to keep the `src`.
+    - image_format (str | None): Format the images are re-encoded to, None to keep the downloaded bytes.
+    - image_quality (int): Encoder quality when re-encoding images.
+    - request_interval (float): Minimum number of seconds between two requests to one host.
+    - metrics (dict): Counters of the run, written next to the extracted data.
     """
 
-    def __init__(self, search_phrase: str, no_of_months: int, category: str) -> None:
+    def __init__(
+            self, search_phrase: str, no_of_months: int, category: str | None,
+            similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD, fetch_articles: bool = False,
+            page_cache_ttl: float = 900, dataset_dir: str | None = None,
+            till_date: date | None = None, from_date: date | None = None,
+            categories: list[str] | None = None, image_width: int | None = None,
+            image_format: str | None = None, image_quality: int = 80, request_interval: float = 0.5
+    ) -> None:
         """
         Initialize the ApNews object with search phrase, number of months, and category.
 
         Args:
         - search_phrase (str): The phrase to search for in the news articles.
         - no_of_months (int): The number of months to go back from the current date.
-        - category (str): The category of news articles to filter by.
+        - category (str | None): The category of news articles to filter by.
+        - similarity_threshold (float): Similarity at which two news items are treated as the same story.
+        - fetch_articles (bool): Whether to fetch the full article of each news item.
+        - page_cache_ttl (float): Number of seconds a cached results page stays fresh.
+        - dataset_dir (str | None): Root of the parquet dataset the items are appended to, if any.
+        - till_date (date | None): Oldest publication date to extract, overriding no_of_months.
+        - from_date (date | None): Newest publication date to extract, None for no upper limit.
+        - categories (list[str] | None): The categories to sweep, overriding category.
+        - image_width (int | None): Minimum width of the image rendition to download, None to keep the `src`.
+        - image_format (str | None): Format the images are re-encoded to, None to keep the downloaded bytes.
+        - image_quality (int): Encoder quality when re-encoding images.
+        - request_interval (float): Minimum number of seconds between two requests to one host.
+
+        Raises:
+        - ValueError: If image_format is not a supported format, before anything is scraped.
         """
         self.base_url = "https://apnews.com/"
         self.search_phrase = search_phrase
         self.category = category
+        self.categories = categories or ([category] if category else [])
         self.news_count = 0
         self.output_dir = 'output'
         self.results = []
-        self.till_date = get_till_date(no_of_months)
+        self.till_date = till_date or get_till_date(no_of_months)
+        self.from_date = from_date
+        self.search_url = None
+        self.results_url = None
+        self.items_by_url = {}
+        self.shared_count = 0
+        self.similarity_threshold = similarity_threshold
+        self.duplicate_count = 0
+        self.fetch_articles = fetch_articles
+        self.scheduler = HostScheduler(min_interval=request_interval)
+        self.article_fetcher = ArticleFetcher(scheduler=self.scheduler) if fetch_articles else None
+        self.page_cache = PageCache(ttl=page_cache_ttl)
+        self.dataset_dir = dataset_dir
+        self.locator_engine = LocatorEngine()
+        self.image_width = image_width
+        self.image_format = normalize_image_format(image_format)
+        self.image_quality = image_quality
+        self.metrics = {}
 
         # Creating directory structure
         self.create_directory_structure()
@@ -58,7 +122,7 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         """
         Close the donation popup if it appears on the page.
         """
-        self.click_element_when_visible(self.DONATION_POP_CROSS_LOCATOR, timeout=30)
+        self.click_element_when_visible(self.DONATION_POP_CROSS_LOCATOR, timeout=30, optional=True)
         logger.info('Closed Donation Popup')
 
     def accept_cookies(self) -> None:
@@ -66,7 +130,7 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         Accepting Cookies if it appears on the page.
         """
         try:
-            self.click_element_when_visible(self.COOKIES_LOCATOR, timeout=30)
+            self.click_element_when_visible(self.COOKIES_LOCATOR, timeout=30, optional=True)
             logger.info('Accepted cookies.')
         except AssertionError:
             logger.warning('Cookies popup was not appeared.')
@@ -89,9 +153,12 @@ class ApNews(BrowserWrapper, ApNewsLocators):
             logger.warning(f'search execution failed due to {e}')
             raise AssertionError
 
-    def select_category_filter(self) -> None:
+    def select_category_filter(self) -> bool:
         """
-        Select the category filter for the search results.
+        Select the current category filter for the search results.
+
+        Returns:
+        - bool: True if the category was selected, False otherwise.
         """
 
         try:
@@ -106,8 +173,10 @@ class ApNews(BrowserWrapper, ApNewsLocators):
 
             self.browser.reload_page()
             logger.info('Page reloaded')
+            return True
         except AssertionError as e:
             logger.warning(f'Category selection failed due to {e}')
+            return False
 
     def select_sort_by(self) -> None:
         """
@@ -137,11 +206,8 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         Returns:
         - str: The extracted title or description text.
         """
-        try:
-            elem = element.find_element(By.XPATH, locator)
-            return self.get_element_text(elem)
-        except NoSuchElementException:
-            return None
+        elem = self.locator_engine.find(locator, element)
+        return self.get_element_text(elem) if elem else None
 
     def get_date(self, element: WebElement) -> tuple:
         """
@@ -154,12 +220,11 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         - tuple: The extracted date and a boolean indicating if the date limit is reached.
         """
         try:
-            date_element = element.find_element(By.XPATH, self.DATE_NOW_LOCATOR)
-        except (StaleElementReferenceException, NoSuchElementException):
-            try:
-                date_element = element.find_element(By.XPATH, self.DATE_LOCATOR)
-            except NoSuchElementException:
-                date_element = None
+            date_element = self.locator_engine.find(self.DATE_NOW_LOCATOR, element)
+        except StaleElementReferenceException:
+            date_element = None
+        if not date_element:
+            date_element = self.locator_engine.find(self.DATE_LOCATOR, element)
 
         if not date_element:
             return None, False
@@ -171,7 +236,8 @@ class ApNews(BrowserWrapper, ApNewsLocators):
 
     def get_image(self, element: WebElement) -> str | None:
         """
-        Get the image URL from a web element.
+        Get the image URL from a web element, choosing the smallest rendition of at least
+        `image_width` pixels among the `srcset` and `<picture>` candidates when it is set.
 
         Args:
         - element: The web element to extract the image URL from.
@@ -179,42 +245,83 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         Returns:
         - str: The extracted image URL.
         """
-        try:
-            image_element = element.find_element(By.XPATH, self.IMAGE_LOCATOR)
-        except NoSuchElementException:
+        image_element = self.locator_engine.find(self.IMAGE_LOCATOR, element)
+        if not image_element:
             return None
-        return self.get_image_attribute(image_element, "src")
+        if self.image_width is None:
+            return self.get_image_attribute(image_element, "src")
+        return select_rendition(self.execute_script(IMAGE_SOURCES_SCRIPT, image_element), self.image_width)
 
-    def process_elements(self, elements: list[WebElement]) -> bool:
+    def get_link(self, element: WebElement) -> str | None:
         """
-        Process each element in the list of elements to extract news details.
+        Get the article URL from a web element.
 
         Args:
-        - elements: The list of web elements representing news articles.
+        - element: The web element to extract the article URL from.
+
+        Returns:
+        - str: The extracted article URL.
+        """
+        link_element = self.locator_engine.find(self.LINK_LOCATOR, element)
+        if not link_element:
+            return None
+        return self.get_image_attribute(link_element, "href")
+
+    def extract_card(self, element: WebElement) -> dict:
+        """
+        Extract the news details shown on a search result card.
+
+        Args:
+        - element: The web element representing a news article.
+
+        Returns:
+        - dict: The card title, description, date, image and url.
+        """
+        return {
+            'title': self.get_title_or_description(element, self.TITLE_LOCATOR),
+            'description': self.get_title_or_description(element, self.DESCRIPTION_LOCATOR),
+            'date': self.get_date(element)[0],
+            'image': self.get_image(element),
+            'url': self.get_link(element),
+        }
+
+    def process_cards(self, cards: list[dict], stop_at_limit: bool = True) -> bool:
+        """
+        Process each card of a results page into a news item.
+
+        Args:
+        - cards: The news details of each card, as returned by `extract_card`.
+        - stop_at_limit (bool): Stop at the first article beyond the date limit instead of skipping it.
 
         Returns:
         - bool: A boolean indicating if the date limit has been reached.
         """
         date_limit_reached = False
-        for element_index, element in enumerate(elements, start=1):
-            title = self.get_title_or_description(element, self.TITLE_LOCATOR)
-            description = self.get_title_or_description(element, self.DESCRIPTION_LOCATOR)
-            news_date, date_limit_reached = self.get_date(element)
-            image_url = self.get_image(element)
+        for card in cards:
+            if self.from_date and card['date'] and card['date'] > self.from_date.isoformat():
+                continue
+            date_limit_reached = reached_date_limit(self.till_date, card['date'])
             if date_limit_reached:
-                break
+                if stop_at_limit:
+                    break
+                continue
+            shared_item = self.items_by_url.get(card['url']) if card['url'] else None
+            if shared_item:
+                if self.category and self.category not in shared_item.categories:
+                    shared_item.categories.append(self.category)
+                    self.shared_count += 1
+                continue
             self.news_count += 1
-            self.results.append(
-                APNewsItem(
-                    id=self.news_count,
-                    title=title,
-                    description=description,
-                    date=news_date,
-                    image=image_url,
-                    search_phrase=self.search_phrase,
-                    image_name=None
-                )
+            item = APNewsItem(
+                id=self.news_count,
+                search_phrase=self.search_phrase,
+                image_name=None,
+                categories=[self.category] if self.category else [],
+                **card
             )
+            self.results.append(item)
+            if item.url:
+                self.items_by_url[item.url] = item
 
         return date_limit_reached
 
@@ -226,7 +333,9 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         - int: The value of the last page.
         """
         try:
-            pagination_element = self.find_element_when_visible(self.PAGE_COUNT_LOCATOR, timeout=30)
+            pagination_element = self.find_element_when_visible(
+                self.locator_engine.rpa_locator(self.PAGE_COUNT_LOCATOR), timeout=30
+            )
             pagination = self.browser.get_text(pagination_element)
             last_page_value = pagination.split(' ')[-1]
             return int(last_page_value.replace(',', ''))
@@ -234,69 +343,282 @@ class ApNews(BrowserWrapper, ApNewsLocators):
             logger.warning(f"couldn't get pagination due to {e}")
         return 1
 
+    def go_to_page(self, page: int) -> list[WebElement]:
+        """
+        Navigate to a results page and wait for its news elements.
+
+        Args:
+        - page (int): The results page number.
+
+        Returns:
+        - list: The web elements representing the news articles on the page.
+        """
+        url = build_page_url(self.results_url, page, self.PAGE_QUERY_PARAM)
+        page_load_key = f'browser:{self.scheduler.host_of(url)}'
+        with self.scheduler.slot(url, timeout_errors=(AssertionError,), key=page_load_key):
+            self.go_to(url)
+            logger.info(f'Navigated to page {page}')
+            return self.find_elements_when_visible(
+                self.locator_engine.rpa_locator(self.RESULTS_LOCATOR), timeout=30
+            )
+
+    def page_cache_key(self, page: int) -> tuple:
+        """
+        Get the cache key of a results page.
+
+        The key is the page URL the browser actually reached, which encodes the query, sort order
+        and category filter, so results whose sorting or filtering failed are cached apart.
+
+        Args:
+        - page (int): The results page number.
+
+        Returns:
+        - tuple: The results page URL and the image width.
+        """
+        return build_page_url(self.results_url, page, self.PAGE_QUERY_PARAM), self.image_width
+
+    def get_page_cards(self, page: int) -> list[dict]:
+        """
+        Get the news details of a results page, from the page cache when it holds a fresh copy.
+
+        Otherwise the page is loaded in the browser and its cards are cached.
+
+        Args:
+        - page (int): The results page number.
+
+        Returns:
+        - list[dict]: The news details of each card on the page.
+        """
+        key = self.page_cache_key(page)
+        cards = self.page_cache.get(key)
+        if cards is not None:
+            self.page_cache.hits += 1
+            return cards
+
+        self.page_cache.misses += 1
+        cards = [self.extract_card(element) for element in self.go_to_page(page)]
+        self.page_cache.put(key, cards)
+        return cards
+
+    def get_page_dates(self, page: int) -> list[str]:
+        """
+        Get the dates of the news articles shown on a results page.
+
+        Args:
+        - page (int): The results page number.
+
+        Returns:
+        - list[str]: The parsed ISO dates in page order, empty if the page could not be loaded.
+        """
+        try:
+            cards = self.get_page_cards(page)
+        except AssertionError as e:
+            logger.warning(f"couldn't load page {page} due to {e}")
+            return []
+        return [card['date'] for card in cards if card['date']]
+
+    def locate_cutoff_page(self, last_page: int) -> int | None:
+        """
+        Find the last results page inside the date window from the card dates.
+
+        Args:
+        - last_page (int): The last page reported by the pagination.
+
+        Returns:
+        - int | None: The last page to fetch, or None if a probed page could not be loaded.
+
+        Raises:
+        - UnsortedResultsError: If the results are not sorted newest first.
+        """
+        if last_page <= 1:
+            return last_page
+        cutoff_page = find_cutoff_page(self.get_page_dates, last_page, self.till_date)
+        if cutoff_page is not None:
+            logger.info(f'Date limit falls on page {cutoff_page} of {last_page}')
+        return cutoff_page
+
+    def locate_start_page(self, cutoff_page: int) -> int:
+        """
+        Find the first results page reaching back to the from date by bisecting on the card dates.
+
+        Args:
+        - cutoff_page (int): The last page to fetch.
+
+        Returns:
+        - int: The first page to fetch, 1 if there is no from date or it could not be located.
+        """
+        if not self.from_date or cutoff_page <= 1:
+            return 1
+        try:
+            start_page = find_start_page(self.get_page_dates, cutoff_page, self.from_date)
+        except UnsortedResultsError as e:
+            logger.warning(f'{e}, starting from the first page')
+            return 1
+        if start_page is None:
+            logger.warning("couldn't locate the from date, starting from the first page")
+            return 1
+        logger.info(f'From date falls on page {start_page}')
+        return start_page
+
     def get_news_details(self) -> None:
         """
         Iterate through the pages and extract news details.
 
         This method will:
         - Get the total number of pages from the pagination element.
-        - Iterate through each page, extract news details, and process them.
-        - Check if the date limit is reached for any news article and stop the iteration if it is.
+        - Search the pages on their card dates for the first and last pages inside the date window.
+        - Fetch each page between them, extract news details, and process them.
+        - If a probed page could not be loaded, scan from the first page and stop at the first
+          article older than the date limit.
+        - If the results turn out not to be sorted newest first, scan at most
+          `UNSORTED_SCAN_PAGES` pages, skipping out of window articles.
         - Log each significant step of the process.
 
         The iteration stops if:
-        - The date limit is reached, or
-        - The last page is processed.
+        - The date limit is reached while the results are sorted, or
+        - The cutoff page is processed.
         """
-        last_page = self.get_last_page_value() + 1
-        for index in range(2, last_page):
+        self.results_url = self.get_location()
+        last_page = self.get_last_page_value()
+        stop_at_limit = True
+        start_page = 1
+        try:
+            cutoff_page = self.locate_cutoff_page(last_page)
+        except UnsortedResultsError as e:
+            cutoff_page, stop_at_limit = min(last_page, UNSORTED_SCAN_PAGES), False
+            logger.warning(f'{e}, scanning the first {cutoff_page} pages and skipping out of window articles')
+        else:
+            if cutoff_page is None:
+                cutoff_page = last_page
+                logger.warning("couldn't locate the date limit, scanning until the first article beyond it")
+            else:
+                start_page = self.locate_start_page(cutoff_page)
+
+        for index in range(start_page, cutoff_page + 1):
             try:
-                self.wait_until_page_does_not_contain_element(self.RESULTS_LOCATOR, timeout=30)
-                logger.info('Waited until page does not contain results element')
-            except AssertionError:
-                logger.warning('Results element did not disappear in 30 seconds')
+                cards = self.get_page_cards(index)
+            except AssertionError as e:
+                logger.warning(f"couldn't load page {index} due to {e}")
+                continue
 
-            news_elements = self.find_elements_when_visible(self.RESULTS_LOCATOR, timeout=30)
-            date_limit_reached = self.process_elements(news_elements)
+            date_limit_reached = self.process_cards(cards, stop_at_limit)
             logger.info('Element processed')
 
-            if date_limit_reached:
+            if date_limit_reached and stop_at_limit:
                 logger.info('Reached to date limit')
                 break
 
-            self.click_element_when_visible(self.NEXT_PAGE_LOCATOR)
-            logger.info(f'Clicked on next page {index}')
-
     def execute_process(self) -> None:
         """
         Execute the process to extract news articles from the AP News website.
         """
+        self.scrape()
+        self.export()
+
+    def scrape(self) -> None:
+        """
+        Search the AP News website and extract the news items inside the date window.
+        """
         logger.info('Process Execution started.')
         self.open_browser(self.base_url, True)
         logger.info('Browser opened')
 
-        logger.info('Closing popup by cross.')
-        self.close_donation_popup_by_cross()
+        try:
+            logger.info('Closing popup by cross.')
+            self.close_donation_popup_by_cross()
+
+            logger.info('Accepting cookies.')
+            self.accept_cookies()
+
+            logger.info('Searching news.')
+            self.perform_search()
+
+            logger.info('Selecting newest filter.')
+            self.select_sort_by()
+            self.search_url = self.get_location()
+
+            logger.info('Checking locators.')
+            self.check_locators()
+
+            if not self.categories:
+                logger.info('Scrapping articles.')
+                self.get_news_details()
+            for index, category in enumerate(self.categories):
+                self.sweep_category(category, reset=index > 0)
+            logger.info(f'Articles scrapped, page cache hit ratio {self.page_cache.metrics()["hit_ratio"]}')
+            if self.shared_count:
+                logger.info(f'{self.shared_count} articles were shared across categories')
+        finally:
+            logger.info('Closing Browser after getting articles.')
+            self.close_browser()
+            logger.info('Browser closed after getting articles.')
+
+    def check_locators(self) -> None:
+        """
+        Validate the results page locators against the first results page in one pass, as soon
+        as it has loaded and without waiting for any element.
+
+        Raises:
+        - AssertionError: If a required locator matches nothing, or if no result matches while
+          the page does not show the no results marker either.
+        """
+        locators = {name: getattr(self, name) for name in self.HEALTH_CHECK_LOCATORS}
+        report = self.locator_engine.health_check(self.browser.driver, locators, self.RESULTS_LOCATOR)
+        self.metrics['locator_health'] = report
+        for name, result in report.items():
+            logger.info(
+                f"Locator {name}: {result['count']} matches via {result['strategy']}, "
+                f"candidates took {result['ms']} ms"
+            )
+        logger.info(f'Locator health check took {self.locator_engine.last_check_ms:.1f} ms')
 
-        logger.info('Accepting cookies.')
-        self.accept_cookies()
+        if report['RESULTS_LOCATOR']['count'] == 0:
+            if report['NO_RESULT_FOUND']['count']:
+                logger.warning('Search returned no results, nothing to check the locators against')
+                return
+            raise AssertionError('Broken locators: RESULTS_LOCATOR matches nothing and the no results marker is not shown')
 
-        logger.info('Searching news.')
-        self.perform_search()
+        broken = [name for name in self.REQUIRED_LOCATORS if report[name]['count'] == 0]
+        if broken:
+            raise AssertionError(f"Broken locators: {', '.join(broken)}")
 
-        logger.info('Selecting category.')
-        self.select_category_filter()
+    def sweep_category(self, category: str, reset: bool) -> None:
+        """
+        Apply a category filter within the current search session and extract its news items.
 
-        logger.info('Selecting newest filter.')
-        self.select_sort_by()
+        If the filter cannot be applied the category is skipped, unless it is the only one, in
+        which case the unfiltered results are extracted without any category.
 
-        logger.info('Scrapping articles.')
+        Args:
+        - category (str): The category to filter by.
+        - reset (bool): Whether to go back to the unfiltered search results first.
+        """
+        self.category = category
+        if reset:
+            self.go_to(self.search_url)
+            logger.info('Returned to unfiltered search results')
+
+        logger.info(f'Selecting category {category}.')
+        if not self.select_category_filter():
+            if len(self.categories) > 1:
+                logger.warning(f'Skipping category {category}')
+                return
+            logger.warning(f'Extracting unfiltered results without category {category}')
+            self.category = None
+
+        logger.info(f'Scrapping articles of category {self.category}.')
         self.get_news_details()
-        logger.info('Articles scrapped')
 
-        logger.info('Closing Browser after getting articles.')
-        self.close_browser()
-        logger.info('Browser closed after getting articles.')
+    def export(self) -> None:
+        """
+        Deduplicate and enrich the extracted news items, then download their images and export them.
+        """
+        logger.info('Removing duplicate articles.')
+        self.remove_duplicates()
+
+        if self.fetch_articles:
+            logger.info('Fetching full articles.')
+            self.enrich_articles()
 
         logger.info('Downloading images from results.')
         self.download_images()
@@ -306,20 +628,56 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         self.write_items_to_excel()
         logger.info('Wrote results into excel.')
 
+        if self.dataset_dir:
+            logger.info('Appending results to dataset.')
+            self.write_items_to_dataset()
+            logger.info('Appended results to dataset.')
+
+        self.write_run_metrics()
+
+    def remove_duplicates(self) -> None:
+        """
+        Collapse repeated stories in the extracted news items before downloading and exporting them.
+        """
+        self.results, self.duplicate_count = deduplicate_items(self.results, self.similarity_threshold)
+        logger.info(f'Removed {self.duplicate_count} duplicate articles, {len(self.results)} left')
+
+    def enrich_articles(self) -> None:
+        """
+        Fetch the full article of each news item and add its body and byline.
+        """
+        articles = self.article_fetcher.fetch_all([instance.url for instance in self.results])
+        for instance in self.results:
+            article = articles.get(instance.url)
+            if article:
+                instance.body = article['body']
+                instance.byline = article['byline']
+        logger.info(
+            f'Fetched {len(articles)} articles, {self.article_fetcher.cache_hits} served from cache'
+        )
+
     def download_images(self, file_name: str = 'APNews_images') -> None:
         """
-        Download images from the extracted news items.
+        Download images from the extracted news items, re-encoding them if `image_format` is set.
 
         Args:
         - file_name (str): The directory to save the downloaded images.
         """
         output_dir = f'{self.output_dir}/{file_name}'
-        os.makedirs(output_dir, exist_ok=True)
-        for instance in self.results:
-            instance.image_name = download_by_image_url(output_dir, instance.image)
+        downloader = ImageDownloader(
+            output_dir, scheduler=self.scheduler, image_format=self.image_format, quality=self.image_quality,
+            max_width=self.image_width, max_workers=int(self.scheduler.max_limit)
+        )
+        image_names = downloader.download_all([instance.image for instance in self.results])
+        for instance, image_name in zip(self.results, image_names):
+            instance.image_name = image_name
         logger.info('Images download Completed')
         make_archive(output_dir, output_dir)
-        logger.info('Archived Images Completed')
+        self.metrics['images'] = {**downloader.metrics(), 'archive_bytes': os.path.getsize(f'{output_dir}.zip')}
+        logger.info(
+            f"Archived Images Completed, {self.metrics['images']['bytes_transferred']} bytes downloaded, "
+            f"{self.metrics['images']['archive_bytes']} bytes archived"
+        )
 
     def write_items_to_excel(
             self, file_name: str = "extracted_data.xlsx", sheet_name: str = "Extracted Data"
@@ -338,6 +696,10 @@ class ApNews(BrowserWrapper, ApNewsLocators):
             "Description",
             "date",
             "Image Name",
+            "Categories",
+            "URL",
+            "Byline",
+            "Body",
             "Contains Money",
             "Phrase Count"
         ]
@@ -350,6 +712,10 @@ class ApNews(BrowserWrapper, ApNewsLocators):
                 instance.description,
                 instance.date,
                 instance.image_name,
+                ', '.join(instance.categories),
+                instance.url,
+                instance.byline,
+                instance.body[:EXCEL_CELL_LIMIT] if instance.body else None,
                 instance.containing_amount,
                 instance.count_of_search_phrase
             ])
@@ -357,3 +723,30 @@ class ApNews(BrowserWrapper, ApNewsLocators):
         self.excel.append_rows_to_worksheet(rows, name=sheet_name)
         self.excel.save_workbook()
         logger.info('Execution Completed')
+
+    def write_items_to_dataset(self) -> None:
+        """
+        Append the extracted news items to the parquet dataset, partitioned by search phrase and date.
+        """
+        paths = write_items_to_dataset(self.results, self.dataset_dir)
+        logger.info(f'Wrote {len(self.results)} items to {len(paths)} dataset partitions')
+
+    def write_run_metrics(self, file_name: str = "run_metrics.json") -> None:
+        """
+        Write the counters of the run, including the current host limits and throttling events.
+
+        Args:
+        - file_name (str): The name of the metrics file in the output directory.
+        """
+        self.metrics.update({
+            'articles': len(self.results),
+            'duplicates': self.duplicate_count,
+            'shared_across_categories': self.shared_count,
+            'article_cache_hits': self.article_fetcher.cache_hits if self.article_fetcher else None,
+            'page_cache': self.page_cache.metrics(),
+            'scheduler': self.scheduler.metrics(),
+            'timeouts': self.timeouts.metrics(),
+        })
+        with open(f'{self.output_dir}/{file_name}', 'w', encoding='utf-8') as file:
+            json.dump(self.metrics, file, indent=2)
+        logger.info(f'Run metrics written to {file_name}')
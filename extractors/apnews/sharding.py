@@ -0,0 +1,55 @@
+from datetime import date
+
+from extractors.apnews.models import APNewsItem
+
+
+def shard_payloads(payload: dict, shards: list[tuple[date, date]]) -> list[dict]:
+    """
+    Build the work item payload of each date shard of a request.
+
+    Args:
+    - payload (dict): The payload of the original work item.
+    - shards (list[tuple[date, date]]): The oldest and newest date of each shard.
+
+    Returns:
+    - list[dict]: The original payload limited to each shard's date window.
+    """
+    return [
+        {
+            **payload,
+            "till_date": till_date.isoformat(),
+            "from_date": from_date.isoformat(),
+            "shard": index,
+            "shards": len(shards),
+        }
+        for index, (till_date, from_date) in enumerate(shards)
+    ]
+
+
+def merge_shard_items(payloads: list[dict]) -> list[APNewsItem]:
+    """
+    Combine the news items extracted by each shard, newest shard first, and renumber them.
+
+    Args:
+    - payloads (list[dict]): The output payloads of the shards, each holding its `items`.
+
+    Returns:
+    - list[APNewsItem]: The news items of every shard in result order.
+
+    Raises:
+    - ValueError: If the output of any planned shard is missing, so a failed shard cannot
+      silently leave its date window out of the merged results.
+    """
+    planned = max((payload.get("shards", 1) for payload in payloads), default=0)
+    missing = sorted(set(range(planned)) - {payload.get("shard", 0) for payload in payloads})
+    if missing:
+        raise ValueError(f"Missing {len(missing)} of {planned} shards: {missing}")
+
+    items = [
+        APNewsItem(**item)
+        for payload in sorted(payloads, key=lambda payload: payload.get("shard", 0))
+        for item in payload.get("items", [])
+    ]
+    for news_count, item in enumerate(items, start=1):
+        item.id = news_count
+    return items
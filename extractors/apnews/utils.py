@@ -1,10 +1,10 @@
-import os
 import re
 import shutil
 import uuid
 from datetime import datetime, date, timedelta
+from typing import Callable
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-import requests
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
 
@@ -28,33 +28,37 @@ def get_till_date(number_of_months: int) -> date:
     return (datetime.now() - relativedelta(months=number_of_months)).date()
 
 
-def contains_amount(title: str, description: str) -> bool:
+def contains_amount(title: str, description: str, body: str | None = None) -> bool:
     """
-    Check if the given title or description contains any monetary amount.
+    Check if the given title, description or article body contains any monetary amount.
 
     Args:
     - title (str): The title of the news item.
     - description (str): The description of the news item.
+    - body (str | None): The article body of the news item, if it was fetched.
 
     Returns:
     - bool: True if any monetary amount is found, False otherwise.
     """
-    return bool(re.findall(AMOUNT_REGEX, f"{title} {description}", re.IGNORECASE))
+    text = f"{title} {description} {body}" if body else f"{title} {description}"
+    return bool(re.findall(AMOUNT_REGEX, text, re.IGNORECASE))
 
 
-def count_search_phrase(title: str, description: str, phrase: str) -> int:
+def count_search_phrase(title: str, description: str, phrase: str, body: str | None = None) -> int:
     """
-    Count the occurrences of a search phrase in the title and description.
+    Count the occurrences of a search phrase in the title, description and article body.
 
     Args:
     - title (str): The title of the news item.
     - description (str): The description of the news item.
     - phrase (str): The search phrase to count.
+    - body (str | None): The article body of the news item, if it was fetched.
 
     Returns:
     - int: The count of search phrase occurrences.
     """
-    return len(re.findall(re.escape(phrase), f"{title} {description}", re.IGNORECASE))
+    text = f"{title} {description} {body}" if body else f"{title} {description}"
+    return len(re.findall(re.escape(phrase), text, re.IGNORECASE))
 
 
 def parse_date(date_str: str) -> str | None:
@@ -103,6 +107,175 @@ def reached_date_limit(till_date: date, last_item_date: str | None) -> bool:
     return False
 
 
+def build_page_url(url: str, page: int, param: str = "p") -> str:
+    """
+    Build the URL of a given results page from a search results URL.
+
+    Args:
+    - url (str): The search results URL, with or without a page parameter.
+    - page (int): The page number to point the URL at.
+    - param (str): The query parameter holding the page number.
+
+    Returns:
+    - str: The search results URL for the requested page.
+    """
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query, keep_blank_values=True)
+    query[param] = [str(page)]
+    return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
+
+
+class UnsortedResultsError(Exception):
+    """
+    Raised when the probed card dates show that the results are not sorted newest first.
+    """
+
+
+def is_sorted_newest(pages: dict[int, list[str]]) -> bool:
+    """
+    Check that the probed card dates are ordered newest first within and across pages.
+
+    Args:
+    - pages (dict[int, list[str]]): ISO card dates keyed by page number.
+
+    Returns:
+    - bool: True if no older card precedes a newer one, False otherwise.
+    """
+    previous_oldest = None
+    for page in sorted(pages):
+        dates = pages[page]
+        if any(older > newer for newer, older in zip(dates, dates[1:])):
+            return False
+        if previous_oldest is not None and dates[0] > previous_oldest:
+            return False
+        previous_oldest = dates[-1]
+    return True
+
+
+def find_cutoff_page(probe: Callable[[int], list[str]], last_page: int, till_date: date) -> int | None:
+    """
+    Search the results pages for the last page that still starts inside the date window.
+
+    The results are expected to be sorted newest first, so a page is inside the window when
+    its first card is not older than the till date. Pages 1, 2, 4, 8, ... are probed until one
+    falls outside the window, then the range after the last page inside is bisected, so a
+    cutoff on page `n` costs about 2 * log2(n) page loads whatever the number of pages.
+
+    Args:
+    - probe (Callable[[int], list[str]]): Returns the ISO card dates shown on a given page,
+      empty if the page could not be loaded.
+    - last_page (int): The last page reported by the pagination.
+    - till_date (date): The date limit.
+
+    Returns:
+    - int | None: The last page to fetch, or None if a probed page could not be loaded.
+
+    Raises:
+    - UnsortedResultsError: If the probed dates are not sorted newest first.
+    """
+    probed = {}
+
+    def inside_window(page: int) -> bool | None:
+        dates = probe(page)
+        if not dates:
+            return None
+        probed[page] = dates
+        if not is_sorted_newest(probed):
+            raise UnsortedResultsError(f'Card dates are not sorted newest first up to page {page}')
+        return not reached_date_limit(till_date, dates[0])
+
+    first_inside = inside_window(1)
+    if first_inside is None:
+        return None
+    if not first_inside:
+        return 1
+
+    low, high = 1, last_page
+    while low < last_page:
+        page = min(low * 2, last_page)
+        page_inside = inside_window(page)
+        if page_inside is None:
+            return None
+        if not page_inside:
+            high = page - 1
+            break
+        low = page
+
+    while low < high:
+        middle = (low + high + 1) // 2
+        middle_inside = inside_window(middle)
+        if middle_inside is None:
+            return None
+        if middle_inside:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def find_start_page(probe: Callable[[int], list[str]], last_page: int, from_date: date) -> int | None:
+    """
+    Binary search the results pages for the first page reaching back to the newest date of the window.
+
+    The results are expected to be sorted newest first, so a page reaches the window when its
+    last card is not newer than the from date. Pages are checked for monotonic dates the same
+    way as in `find_cutoff_page`.
+
+    Args:
+    - probe (Callable[[int], list[str]]): Returns the ISO card dates shown on a given page,
+      empty if the page could not be loaded.
+    - last_page (int): The last page that may hold articles of the window.
+    - from_date (date): The newest publication date of the window.
+
+    Returns:
+    - int | None: The first page to fetch, or None if a probed page could not be loaded.
+
+    Raises:
+    - UnsortedResultsError: If the probed dates are not sorted newest first.
+    """
+    probed = {}
+    low, high = 1, last_page
+    while low < high:
+        middle = (low + high) // 2
+        dates = probe(middle)
+        if not dates:
+            return None
+        probed[middle] = dates
+        if not is_sorted_newest(probed):
+            raise UnsortedResultsError(f'Card dates are not sorted newest first up to page {middle}')
+        if dates[-1] <= from_date.isoformat():
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def plan_date_shards(till_date: date, from_date: date, shard_days: int) -> list[tuple[date, date]]:
+    """
+    Split a date window into consecutive shards, newest first.
+
+    Args:
+    - till_date (date): The oldest publication date of the window.
+    - from_date (date): The newest publication date of the window.
+    - shard_days (int): The number of days covered by each shard.
+
+    Returns:
+    - list[tuple[date, date]]: The oldest and newest date of each shard, both inclusive.
+
+    Raises:
+    - ValueError: If shard_days is below 1.
+    """
+    if shard_days < 1:
+        raise ValueError(f"shard_days must be at least 1, got {shard_days}")
+    shards = []
+    newest = from_date
+    while newest >= till_date:
+        oldest = max(till_date, newest - timedelta(days=shard_days - 1))
+        shards.append((oldest, newest))
+        newest = oldest - timedelta(days=1)
+    return shards
+
+
 def make_archive(source: str, destination: str, remove_source=True) -> None:
     """
     Create a zip archive of the specified source directory and save it to the destination.
@@ -121,36 +294,37 @@ def make_archive(source: str, destination: str, remove_source=True) -> None:
             logger.error(f"Failed to remove directory='{source}' image. Error: {e}")
 
 
-def generate_filename() -> str:
+def generate_filename(extension: str = 'png') -> str:
     """
-    Generate a random filename with a .png extension.
+    Generate a random filename with the given extension.
+
+    Args:
+    - extension (str): The file extension, without the dot.
 
     Returns:
     - str: The generated filename.
     """
-    return f"{uuid.uuid4().hex}.png"
+    return f"{uuid.uuid4().hex}.{extension}"
 
 
-def download_by_image_url(output_dir: str, url: str) -> str | None:
+def sniff_image_type(data: bytes) -> str | None:
     """
-    Download an image from a given URL and save it to the specified output directory.
+    Detect the format of an image from its leading bytes.
 
     Args:
-    - output_dir (str): The directory to save the downloaded image.
-    - url (str): The URL of the image to download.
+    - data (bytes): The image content.
 
     Returns:
-    - str | None: The filename of the downloaded image, or None if download fails.
+    - str | None: The file extension of the format, or None if it is not recognized.
     """
-    if not url:
-        return None
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            file_name = os.path.join(output_dir, generate_filename())
-            with open(file_name, "wb") as file:
-                file.write(response.content)
-            return file_name
-    except Exception as e:
-        logger.error(f"Failed to download image. Error: {e}")
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    if data[4:8] == b'ftyp' and data[8:12] in (b'avif', b'avis'):
+        return 'avif'
     return None
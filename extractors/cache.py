@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import time
+
+from extractors.constants import CACHE_DIR
+
+
+class PageCache:
+    """
+    Short-lived on-disk cache of extracted pages, with a size bound and least recently used eviction.
+
+    Each entry is a JSON file holding the cache key, the time it was stored and the cached data.
+    Entries older than `ttl` are stale and are not returned; the next `put` replaces them.
+
+    Attributes:
+        directory (str): Directory holding the cache entries.
+        ttl (float): Number of seconds an entry stays fresh.
+        max_bytes (int): Total size of the entries above which the least recently used are evicted.
+        hits (int): Number of lookups served from a fresh entry.
+        misses (int): Number of lookups that had to fetch the page again.
+    """
+
+    def __init__(
+            self, directory: str = f'{CACHE_DIR}/pages', ttl: float = 900, max_bytes: int = 50 * 1024 * 1024
+    ) -> None:
+        """
+        Initializes the cache and creates its directory.
+
+        Args:
+            directory (str): Directory holding the cache entries.
+            ttl (float): Number of seconds an entry stays fresh.
+            max_bytes (int): Total size of the entries above which the least recently used are evicted.
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key: tuple) -> str:
+        """
+        Get the file of a cache key.
+
+        Args:
+            key (tuple): The JSON serializable cache key.
+
+        Returns:
+            str: The path of the cache entry.
+        """
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.directory, f'{digest}.json')
+
+    def get(self, key: tuple):
+        """
+        Look up a fresh cache entry, marking it as recently used.
+
+        Args:
+            key (tuple): The JSON serializable cache key.
+
+        Returns:
+            The cached data, or None if the entry is absent or stale.
+        """
+        path = self.path(key)
+        try:
+            with open(path, encoding='utf-8') as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() - entry['stored_at'] >= self.ttl:
+            return None
+        return entry['data']
+
+    def put(self, key: tuple, data) -> None:
+        """
+        Store a cache entry atomically, then evict entries beyond the size bound.
+
+        Args:
+            key (tuple): The JSON serializable cache key.
+            data: The JSON serializable data to cache.
+        """
+        path = self.path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'key': list(key), 'stored_at': time.time(), 'data': data}, file)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in `max_bytes`.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def metrics(self) -> dict:
+        """
+        Report the lookups of the run and the share served from the cache.
+
+        Returns:
+            dict: The hit and miss counts and the hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+        }
@@ -1 +1,12 @@
 AMOUNT_REGEX = r'(\$\d+(?:,\d+)*(?:\.\d+)?)|(\d+(?:,\d+)*(?:\.\d+)? dollars)|(\d+(?:,\d+)*(?:\.\d+)? USD)'
+
+# Directory for data kept between runs, such as fetched articles
+CACHE_DIR = '.cache'
+
+# Headers sent with every plain HTTP request
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36'
+}
+
+# Maximum number of characters Excel accepts in a single cell
+EXCEL_CELL_LIMIT = 32767
@@ -0,0 +1,296 @@
+import re
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+_STEP_REGEX = re.compile(r'(//|/)?((?:[^/\[]|\[[^\]]*\])+)')
+_NODE_REGEX = re.compile(r'^([\w-]+|\*)((?:\[[^\]]*\])*)$')
+_PREDICATE_REGEX = re.compile(r'\[\s*@([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')\s*\]')
+_CSS_IDENTIFIER_REGEX = re.compile(r'^-?[_a-zA-Z][\w-]*$')
+
+# Evaluates every candidate of every locator in the browser, in one round trip
+_HEALTH_CHECK_SCRIPT = """
+const [checks, cardCandidates] = arguments;
+function evaluate(context, [kind, value]) {
+    const started = performance.now();
+    let nodes = [];
+    try {
+        if (kind === 'css selector') {
+            nodes = Array.from(context.querySelectorAll(value));
+        } else {
+            const snapshot = document.evaluate(value, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let index = 0; index < snapshot.snapshotLength; index++) nodes.push(snapshot.snapshotItem(index));
+        }
+    } catch (error) {
+        return {count: -1, ms: performance.now() - started, error: String(error)};
+    }
+    return {count: nodes.length, ms: performance.now() - started, nodes: nodes};
+}
+let card = null;
+for (const candidate of cardCandidates) {
+    const result = evaluate(document, candidate);
+    if (result.count > 0) { card = result.nodes[0]; break; }
+}
+return checks.map(([card_scoped, candidates]) => candidates.map(candidate => {
+    const context = card_scoped ? card : document;
+    if (!context) return {count: 0, ms: 0, error: 'no result card'};
+    const {count, ms, error} = evaluate(context, candidate);
+    return {count: count, ms: ms, error: error || null};
+}));
+"""
+
+
+def xpath_to_css(xpath: str) -> str | None:
+    """
+    Compile a simple XPath into an equivalent CSS selector.
+
+    Only child and descendant steps on a tag name with `@attribute="value"` predicates are
+    supported. Class equality predicates become class token selectors, so `a[@class="Link "]`
+    compiles to `a.Link`, which also survives changes to whitespace or extra classes. Relative
+    XPaths compile to `:scope` selectors, so the context element and its ancestors never match
+    the first step.
+
+    Args:
+        xpath (str): The XPath to compile.
+
+    Returns:
+        str | None: The CSS selector, or None if the XPath uses anything unsupported.
+    """
+    if xpath.startswith('.//'):
+        path, selector = xpath[3:], ':scope '
+    elif xpath.startswith('./'):
+        path, selector = xpath[2:], ':scope > '
+    elif xpath.startswith('//'):
+        path, selector = xpath[2:], ''
+    elif xpath.startswith('/'):
+        return None
+    else:
+        path, selector = xpath, ':scope > '
+
+    position = 0
+    for match in _STEP_REGEX.finditer(path):
+        if match.start() != position or (position and not match.group(1)):
+            return None
+        position = match.end()
+        if match.group(1):
+            selector += ' > ' if match.group(1) == '/' else ' '
+        node = compile_node(match.group(2).strip())
+        if node is None:
+            return None
+        selector += node
+    if position != len(path) or not path:
+        return None
+    return selector
+
+
+def compile_node(step: str) -> str | None:
+    """
+    Compile a single XPath step into a CSS compound selector.
+
+    Args:
+        step (str): The XPath step, a tag name with optional attribute predicates.
+
+    Returns:
+        str | None: The CSS compound selector, or None if the step is unsupported.
+    """
+    match = _NODE_REGEX.match(step)
+    if not match:
+        return None
+    tag, predicates = match.groups()
+    selector = '' if tag == '*' and predicates else tag
+    if predicates and _PREDICATE_REGEX.sub('', predicates).strip():
+        return None
+
+    for attribute, double_quoted, single_quoted in _PREDICATE_REGEX.findall(predicates):
+        value = double_quoted or single_quoted
+        tokens = value.split()
+        if attribute == 'class' and tokens and all(_CSS_IDENTIFIER_REGEX.match(token) for token in tokens):
+            selector += ''.join(f'.{token}' for token in tokens)
+        else:
+            escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+            selector += f'[{attribute}="{escaped}"]'
+    return selector
+
+
+class Locator:
+    """
+    A locator compiled into ordered candidate strategies, fastest first.
+
+    Candidates that never matched are tried in order until one does, which then becomes
+    the preferred candidate. Once a candidate has matched, a miss is taken as the element
+    being absent rather than as a broken locator, so absent elements cost a single lookup.
+
+    Attributes:
+        xpath (str): The original XPath of the locator.
+        candidates (list[tuple[str, str]]): The Selenium strategy and value of each candidate.
+        preferred (int): Index of the candidate that last matched.
+        confirmed (bool): Whether the preferred candidate has matched at least once.
+    """
+
+    def __init__(self, xpath: str) -> None:
+        """
+        Compiles the XPath into its candidates.
+
+        Args:
+            xpath (str): The XPath of the locator.
+        """
+        self.xpath = xpath
+        css = xpath_to_css(xpath)
+        self.candidates = ([(By.CSS_SELECTOR, css)] if css else []) + [(By.XPATH, xpath)]
+        self.preferred = 0
+        self.confirmed = False
+
+    @property
+    def rpa_locator(self) -> str:
+        """
+        The preferred candidate in RPA Framework locator syntax.
+
+        Returns:
+            str: The `css:` or `xpath:` prefixed locator.
+        """
+        kind, value = self.candidates[self.preferred]
+        return f"{'css' if kind == By.CSS_SELECTOR else 'xpath'}:{value}"
+
+    def order(self) -> list[int]:
+        """
+        Get the candidates to try, preferred first.
+
+        Returns:
+            list[int]: The candidate indexes in the order to try them.
+        """
+        if self.confirmed:
+            return [self.preferred]
+        return [self.preferred] + [index for index in range(len(self.candidates)) if index != self.preferred]
+
+    def prefer(self, index: int) -> None:
+        """
+        Remember the candidate that matched.
+
+        Args:
+            index (int): Index of the matching candidate.
+        """
+        self.preferred = index
+        self.confirmed = True
+
+    def find_all(self, parent) -> list[WebElement]:
+        """
+        Find every element matching the locator.
+
+        Args:
+            parent: The web element or driver to search within.
+
+        Returns:
+            list[WebElement]: The matching elements, empty if none.
+        """
+        for index in self.order():
+            elements = parent.find_elements(*self.candidates[index])
+            if elements:
+                self.prefer(index)
+                return elements
+        return []
+
+    def find(self, parent) -> WebElement | None:
+        """
+        Find the first element matching the locator.
+
+        Args:
+            parent: The web element or driver to search within.
+
+        Returns:
+            WebElement | None: The first matching element, or None if there is none.
+        """
+        elements = self.find_all(parent)
+        return elements[0] if elements else None
+
+
+class LocatorEngine:
+    """
+    Registry of compiled locators, keyed by their original XPath.
+
+    Attributes:
+        last_check_ms (float | None): Round trip time of the last health check in milliseconds.
+    """
+
+    def __init__(self) -> None:
+        self.last_check_ms = None
+        self._locators = {}
+
+    def get(self, xpath: str) -> Locator:
+        """
+        Get the compiled locator of an XPath, compiling it on first use.
+
+        Args:
+            xpath (str): The XPath of the locator.
+
+        Returns:
+            Locator: The compiled locator.
+        """
+        if xpath not in self._locators:
+            self._locators[xpath] = Locator(xpath)
+        return self._locators[xpath]
+
+    def find(self, xpath: str, parent) -> WebElement | None:
+        """
+        Find the first element matching an XPath through its compiled locator.
+
+        Args:
+            xpath (str): The XPath of the locator.
+            parent: The web element or driver to search within.
+
+        Returns:
+            WebElement | None: The first matching element, or None if there is none.
+        """
+        return self.get(xpath).find(parent)
+
+    def rpa_locator(self, xpath: str) -> str:
+        """
+        Get the preferred form of an XPath in RPA Framework locator syntax.
+
+        Args:
+            xpath (str): The XPath of the locator.
+
+        Returns:
+            str: The `css:` or `xpath:` prefixed locator.
+        """
+        return self.get(xpath).rpa_locator
+
+    def health_check(self, driver, locators: dict[str, str], card_xpath: str) -> dict[str, dict]:
+        """
+        Evaluate every candidate of the given locators against the current page in one pass.
+
+        Locators starting with `./` are evaluated against the first element matching
+        `card_xpath`, the others against the whole page. The first candidate of each locator
+        that matches becomes its preferred candidate.
+
+        Args:
+            driver: The Selenium web driver showing the page to check.
+            locators (dict[str, str]): The XPath of each locator to check, keyed by name.
+            card_xpath (str): The XPath of the result cards.
+
+        Returns:
+            dict[str, dict]: For each locator, the matching `strategy`, element `count`,
+            evaluation time of each candidate in `ms`, and any `error`.
+        """
+        names = list(locators)
+        compiled = [self.get(locators[name]) for name in names]
+        started = time.perf_counter()
+        results = driver.execute_script(
+            _HEALTH_CHECK_SCRIPT,
+            [[locator.xpath.startswith('./'), locator.candidates] for locator in compiled],
+            self.get(card_xpath).candidates,
+        )
+        self.last_check_ms = (time.perf_counter() - started) * 1000
+
+        report = {}
+        for name, locator, candidate_results in zip(names, compiled, results):
+            matched = next((index for index, result in enumerate(candidate_results) if result['count'] > 0), None)
+            if matched is not None:
+                locator.prefer(matched)
+            report[name] = {
+                'strategy': locator.candidates[matched][0] if matched is not None else None,
+                'count': candidate_results[matched]['count'] if matched is not None else 0,
+                'ms': [round(result['ms'], 2) for result in candidate_results],
+                'error': next((result['error'] for result in candidate_results if result['error']), None),
+            }
+        return report
@@ -0,0 +1,342 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import urlparse
+
+import requests
+
+from extractors.constants import REQUEST_HEADERS
+
+# HTTP statuses a server uses to tell us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+@dataclass
+class HostState:
+    """
+    Concurrency window and counters of a single host.
+
+    Attributes:
+        limit (float): The current number of requests allowed in flight.
+        in_flight (int): The number of requests currently in flight.
+        next_slot (float): Monotonic time before which no new request may start.
+        cooldown_until (float): Monotonic time until which the host asked us to back off.
+        last_decrease (float): Monotonic time of the last multiplicative decrease.
+        latency (float | None): Moving average of the request latency in seconds.
+        baseline (float | None): Lowest moving average latency seen, used as the healthy reference.
+        requests (int): Number of completed requests.
+        throttled (int): Number of 429/503 responses.
+        timeouts (int): Number of timed out requests.
+        errors (int): Number of requests that failed with any other error.
+        lowest_limit (float): Lowest limit reached during the run.
+        highest_limit (float): Highest limit reached during the run.
+    """
+
+    limit: float
+    in_flight: int = 0
+    next_slot: float = 0.0
+    cooldown_until: float = 0.0
+    last_decrease: float = 0.0
+    latency: float | None = None
+    baseline: float | None = None
+    requests: int = 0
+    throttled: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    lowest_limit: float = 0.0
+    highest_limit: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.lowest_limit = self.highest_limit = self.limit
+
+
+class Slot:
+    """
+    Outcome of a single scheduled request, filled in by the caller.
+
+    Attributes:
+        status (int | None): The HTTP status of the response, if any.
+        retry_after (float | None): Seconds the server asked us to wait before retrying.
+    """
+
+    def __init__(self) -> None:
+        self.status = None
+        self.retry_after = None
+
+
+class HostScheduler:
+    """
+    Per-host request scheduler adjusting concurrency with additive increase, multiplicative decrease.
+
+    Each host starts with `initial_limit` requests in flight. Every healthy response grows the
+    limit by `increase / limit`, so roughly by `increase` per window of requests. A 429/503
+    response, a timeout or other failed request, or a latency above `latency_factor` times the
+    best latency seen multiplies the limit by `decrease`, at most once per observed latency.
+    Throttling responses pause the host for their `Retry-After` or `cooldown` seconds, and
+    timeouts and failures for `cooldown` seconds, which also spaces out requests that only ever
+    run one at a time, such as browser page loads. Requests sent through `request` are retried
+    up to `max_retries` times after a throttling response or a timeout, once the pause is over.
+
+    Attributes:
+        initial_limit (float): Concurrency a host starts with.
+        min_limit (float): Lowest concurrency a host can be reduced to.
+        max_limit (float): Highest concurrency a host can grow to.
+        min_interval (float): Minimum number of seconds between two request starts to one host.
+        increase (float): Additive increase per window of healthy requests.
+        decrease (float): Multiplicative decrease factor on congestion.
+        latency_factor (float): Latency, relative to the baseline, treated as congestion.
+        cooldown (float): Seconds to pause a host after a throttling response without Retry-After.
+        max_retries (int): Number of times a throttled or timed out request is retried.
+        events (deque): The most recent limit changes and throttling events.
+    """
+
+    def __init__(
+            self, initial_limit: float = 2, min_limit: float = 1, max_limit: float = 16,
+            min_interval: float = 0.5, increase: float = 1.0, decrease: float = 0.5,
+            latency_factor: float = 3.0, cooldown: float = 5.0, max_retries: int = 3,
+            max_events: int = 100
+    ) -> None:
+        """
+        Initializes the scheduler with its AIMD parameters.
+
+        Args:
+            initial_limit (float): Concurrency a host starts with.
+            min_limit (float): Lowest concurrency a host can be reduced to.
+            max_limit (float): Highest concurrency a host can grow to.
+            min_interval (float): Minimum number of seconds between two request starts to one host.
+            increase (float): Additive increase per window of healthy requests.
+            decrease (float): Multiplicative decrease factor on congestion.
+            latency_factor (float): Latency, relative to the baseline, treated as congestion.
+            cooldown (float): Seconds to pause a host after a throttling response without Retry-After.
+            max_retries (int): Number of times a throttled or timed out request is retried.
+            max_events (int): Number of recent events kept for the run metrics.
+        """
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.min_interval = min_interval
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.max_retries = max_retries
+        self.events = deque(maxlen=max_events)
+        self._hosts = {}
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """
+        Get the scheduling key of a URL, its host and port.
+
+        Args:
+            url (str): The URL about to be requested.
+
+        Returns:
+            str: The host of the URL.
+        """
+        return urlparse(url).netloc
+
+    def _state(self, host: str) -> HostState:
+        if host not in self._hosts:
+            self._hosts[host] = HostState(limit=self.initial_limit)
+        return self._hosts[host]
+
+    def acquire(self, host: str) -> None:
+        """
+        Blocks until the host has a free slot and is not paused, and takes the slot.
+
+        Args:
+            host (str): The host about to be requested.
+        """
+        with self._condition:
+            state = self._state(host)
+            while True:
+                now = time.monotonic()
+                wait = max(state.next_slot, state.cooldown_until) - now
+                if wait <= 0 and state.in_flight < max(int(state.limit), 1):
+                    state.in_flight += 1
+                    state.next_slot = now + self.min_interval
+                    return
+                self._condition.wait(timeout=wait if wait > 0 else None)
+
+    def release(
+            self, host: str, latency: float, status: int | None = None,
+            timed_out: bool = False, retry_after: float | None = None, failed: bool = False
+    ) -> None:
+        """
+        Frees the host slot and adjusts the host limit from the request outcome.
+
+        Args:
+            host (str): The requested host.
+            latency (float): The request latency in seconds.
+            status (int | None): The HTTP status of the response, if any.
+            timed_out (bool): Whether the request timed out.
+            retry_after (float | None): Seconds the server asked us to wait before retrying.
+            failed (bool): Whether the request failed with an error other than a timeout.
+        """
+        with self._condition:
+            state = self._state(host)
+            now = time.monotonic()
+            state.in_flight -= 1
+            state.requests += 1
+
+            throttled = status in THROTTLE_STATUSES
+            if throttled:
+                state.throttled += 1
+                state.cooldown_until = max(state.cooldown_until, now + (retry_after or self.cooldown))
+                self._event(host, 'throttled', state, status=status)
+            if timed_out:
+                state.timeouts += 1
+                self._event(host, 'timeout', state)
+            if failed:
+                state.errors += 1
+                self._event(host, 'error', state)
+            if timed_out or failed:
+                state.cooldown_until = max(state.cooldown_until, now + self.cooldown)
+
+            slow = False
+            if not throttled and not timed_out and not failed:
+                state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+                state.baseline = state.latency if state.baseline is None else min(state.baseline, state.latency)
+                slow = state.latency > self.latency_factor * state.baseline
+
+            if throttled or timed_out or failed or slow:
+                if now - state.last_decrease >= (state.latency or 0):
+                    state.limit = max(self.min_limit, state.limit * self.decrease)
+                    state.last_decrease = now
+                    state.lowest_limit = min(state.lowest_limit, state.limit)
+                    self._event(host, 'decrease', state)
+            else:
+                state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
+                state.highest_limit = max(state.highest_limit, state.limit)
+
+            self._condition.notify_all()
+
+    def _event(self, host: str, kind: str, state: HostState, **details) -> None:
+        self.events.append({
+            'time': time.time(), 'host': host, 'event': kind, 'limit': round(state.limit, 2), **details
+        })
+
+    @contextmanager
+    def slot(
+            self, url: str, timeout_errors: tuple = (requests.Timeout, TimeoutError), key: str | None = None
+    ) -> Iterator[Slot]:
+        """
+        Runs a request to the URL's host inside a scheduled slot, timing it.
+
+        The caller may set the slot `status` and `retry_after` from the response. Exceptions
+        listed in `timeout_errors` are recorded as timeouts and any other exception as a failed
+        request before being re-raised.
+
+        Args:
+            url (str): The URL about to be requested.
+            timeout_errors (tuple): Exception types counted as timeouts.
+            key (str | None): The scheduling key to use instead of the URL's host, to keep
+                requests with their own latency profile, such as browser page loads, apart.
+
+        Yields:
+            Slot: The outcome of the request, to be filled in by the caller.
+        """
+        host = key or self.host_of(url)
+        self.acquire(host)
+        slot = Slot()
+        started = time.monotonic()
+        timed_out = failed = False
+        try:
+            yield slot
+        except timeout_errors:
+            timed_out = True
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(host, time.monotonic() - started, slot.status, timed_out, slot.retry_after, failed)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an HTTP request through the scheduler, retrying throttled and timed out requests.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The requested URL.
+            **kwargs: Keyword arguments passed to `requests.request`.
+
+        Returns:
+            requests.Response: The response, the last throttling one if the retries ran out.
+
+        Raises:
+            requests.Timeout: If the last attempt timed out.
+        """
+        kwargs.setdefault('headers', REQUEST_HEADERS)
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.slot(url) as slot:
+                    response = requests.request(method, url, **kwargs)
+                    slot.status = response.status_code
+                    slot.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except requests.Timeout:
+                if attempt == self.max_retries:
+                    raise
+                continue
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.max_retries:
+                return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an HTTP GET request through the scheduler.
+
+        Args:
+            url (str): The requested URL.
+            **kwargs: Keyword arguments passed to `requests.request`.
+
+        Returns:
+            requests.Response: The response, whatever its status.
+        """
+        return self.request('GET', url, **kwargs)
+
+    def metrics(self) -> dict:
+        """
+        Reports the current limits, counters and recent events of every host.
+
+        Returns:
+            dict: The per-host state and the recent events.
+        """
+        with self._condition:
+            return {
+                'hosts': {
+                    host: {
+                        'limit': round(state.limit, 2),
+                        'lowest_limit': round(state.lowest_limit, 2),
+                        'highest_limit': round(state.highest_limit, 2),
+                        'in_flight': state.in_flight,
+                        'requests': state.requests,
+                        'throttled': state.throttled,
+                        'timeouts': state.timeouts,
+                        'errors': state.errors,
+                        'latency': round(state.latency, 3) if state.latency is not None else None,
+                    }
+                    for host, state in self._hosts.items()
+                },
+                'events': list(self.events),
+            }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header given in seconds.
+
+    Args:
+        value (str | None): The header value.
+
+    Returns:
+        float | None: The number of seconds to wait, or None if absent or not in seconds.
+    """
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,173 @@
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from extractors.constants import CACHE_DIR
+
+
+class TimeoutManager:
+    """
+    Derives the timeout of each wait site from the outcomes observed there, across runs.
+
+    A site's timeout is a high percentile of the latencies of its recent successful waits times
+    `headroom`, kept between `floor` and `ceiling`. Misses never count as latencies, so a broken
+    locator cannot stretch its own timeout. Until a site has `min_samples` outcomes the caller's
+    default is used.
+
+    Waits are required unless the caller marks them optional, as for popups that may never
+    show up. An optional site that missed in at least `miss_ratio` of its recent waits gets the
+    floor. A required site never goes below its learned timeout, and right after a miss it gets
+    the caller's default if that is longer, so a site that was down for a while can succeed
+    again and recover.
+
+    Attributes:
+        path (str): JSON file the statistics are loaded from and saved to.
+        percentile (float): The latency percentile the timeout is derived from.
+        headroom (float): The factor applied to the percentile latency.
+        floor (float): The shortest timeout in seconds.
+        ceiling (float): The longest timeout in seconds.
+        window (int): The number of recent latencies and outcomes kept per site.
+        min_samples (int): The number of outcomes before a site's timeout is derived.
+        miss_ratio (float): The fraction of recent misses at which a site gets the floor.
+        sites (dict): The recent hit latencies and outcomes of each site.
+    """
+
+    def __init__(
+            self, path: str = f'{CACHE_DIR}/timeouts.json', percentile: float = 0.95, headroom: float = 1.5,
+            floor: float = 2, ceiling: float = 60, window: int = 20, min_samples: int = 5,
+            miss_ratio: float = 0.5
+    ) -> None:
+        """
+        Initializes the manager and loads the statistics of previous runs.
+
+        Args:
+            path (str): JSON file the statistics are loaded from and saved to.
+            percentile (float): The latency percentile the timeout is derived from.
+            headroom (float): The factor applied to the percentile latency.
+            floor (float): The shortest timeout in seconds.
+            ceiling (float): The longest timeout in seconds.
+            window (int): The number of recent latencies and outcomes kept per site.
+            min_samples (int): The number of outcomes before a site's timeout is derived.
+            miss_ratio (float): The fraction of recent misses at which a site gets the floor.
+        """
+        self.path = path
+        self.percentile = percentile
+        self.headroom = headroom
+        self.floor = floor
+        self.ceiling = ceiling
+        self.window = window
+        self.min_samples = min_samples
+        self.miss_ratio = miss_ratio
+        self.sites = self.load()
+
+    def load(self) -> dict:
+        """
+        Load the statistics saved by previous runs.
+
+        Returns:
+            dict: The statistics of each site, empty if none were saved.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self) -> None:
+        """
+        Save the statistics for the next runs.
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.sites, file)
+        os.replace(temp_path, self.path)
+
+    def _site(self, site: str) -> dict:
+        return self.sites.setdefault(site, {'latencies': [], 'outcomes': []})
+
+    def timeout(self, site: str, default: float | None, optional: bool = False) -> float | None:
+        """
+        Get the timeout to use at a wait site.
+
+        Args:
+            site (str): The wait site, usually its locator.
+            default (float | None): The timeout to use until the site has enough outcomes, and
+                after a miss at a required site.
+            optional (bool): Whether the waited element may legitimately never appear.
+
+        Returns:
+            float | None: The timeout in seconds.
+        """
+        stats = self.sites.get(site)
+        if not stats or len(stats['outcomes']) < self.min_samples:
+            return default
+        if optional and stats['outcomes'].count(False) >= self.miss_ratio * len(stats['outcomes']):
+            return self.floor
+        if not stats['latencies']:
+            return self.floor if optional else default
+        latencies = sorted(stats['latencies'])
+        rank = max(math.ceil(self.percentile * len(latencies)) - 1, 0)
+        learned = min(max(latencies[rank] * self.headroom, self.floor), self.ceiling)
+        if not optional and not stats['outcomes'][-1] and default is not None:
+            return max(learned, default)
+        return learned
+
+    def record(self, site: str, latency: float | None) -> None:
+        """
+        Record the outcome of a wait.
+
+        Args:
+            site (str): The wait site, usually its locator.
+            latency (float | None): Seconds until the wait succeeded, None if it timed out.
+        """
+        stats = self._site(site)
+        stats['outcomes'] = (stats['outcomes'] + [latency is not None])[-self.window:]
+        if latency is not None:
+            stats['latencies'] = (stats['latencies'] + [round(latency, 3)])[-self.window:]
+
+    @contextmanager
+    def wait(
+            self, site: str, default: float, optional: bool = False, errors: tuple = (AssertionError,)
+    ) -> Iterator[float]:
+        """
+        Time a wait at a site, yielding the timeout to use and recording the outcome.
+
+        Args:
+            site (str): The wait site, usually its locator.
+            default (float): The timeout to use until the site has enough outcomes, and after a
+                miss at a required site.
+            optional (bool): Whether the waited element may legitimately never appear.
+            errors (tuple): Exception types meaning the wait timed out.
+
+        Yields:
+            float: The timeout in seconds.
+        """
+        timeout = self.timeout(site, default, optional)
+        started = time.monotonic()
+        try:
+            yield timeout
+        except errors:
+            self.record(site, None)
+            raise
+        self.record(site, time.monotonic() - started)
+
+    def metrics(self) -> dict:
+        """
+        Report the current timeout and recent hits and misses of each site.
+
+        Returns:
+            dict: The statistics of each site.
+        """
+        report = {}
+        for site, stats in self.sites.items():
+            timeout = self.timeout(site, None)
+            report[site] = {
+                'timeout': round(timeout, 2) if timeout is not None else None,
+                'hits': stats['outcomes'].count(True),
+                'misses': stats['outcomes'].count(False),
+            }
+        return report
@@ -3,6 +3,8 @@ from RPA.Excel.Files import Files
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 
+from extractors.timeouts import TimeoutManager
+
 
 class BrowserWrapper:
     """
@@ -11,6 +13,7 @@ class BrowserWrapper:
     Attributes:
         browser (Selenium): An instance of the Selenium library for browser automation.
         excel (Files): An instance of the Files library for handling Excel files.
+        timeouts (TimeoutManager): Learns the timeout of each wait site from its observed latencies.
     """
 
     def __init__(self, **kwargs) -> None:
@@ -22,6 +25,20 @@ class BrowserWrapper:
         """
         self.browser = Selenium(**kwargs)
         self.excel = Files()
+        self.timeouts = TimeoutManager()
+
+    def _wait_until_visible(self, locator: str, timeout: float, optional: bool = False) -> None:
+        """
+        Waits until an element is visible, with the timeout learned for its locator.
+
+        Args:
+            locator (str): The locator of the element.
+            timeout (float): The timeout to use until the locator's own timeout is learned.
+            optional (bool): Whether the element may legitimately never appear, so that waits
+                for it that keep missing give up quickly.
+        """
+        with self.timeouts.wait(locator, timeout, optional) as adaptive_timeout:
+            self.browser.wait_until_element_is_visible(locator, timeout=adaptive_timeout)
 
     def open_browser(self, url: str, maximize: bool = False) -> None:
         """
@@ -35,6 +52,37 @@ class BrowserWrapper:
             url, maximized=maximize
         )
 
+    def go_to(self, url: str) -> None:
+        """
+        Navigates the current browser window to the specified URL.
+
+        Args:
+            url (str): The URL to navigate to.
+        """
+        self.browser.go_to(url)
+
+    def get_location(self) -> str:
+        """
+        Retrieves the URL of the current page.
+
+        Returns:
+            str: The current page URL.
+        """
+        return self.browser.get_location()
+
+    def execute_script(self, script: str, *args):
+        """
+        Executes JavaScript in the current page.
+
+        Args:
+            script (str): The script to execute, reading its arguments from `arguments`.
+            *args: The arguments passed to the script, web elements included.
+
+        Returns:
+            The value returned by the script.
+        """
+        return self.browser.driver.execute_script(script, *args)
+
     def get_element_text(self, element: WebElement) -> str:
         """
         Retrieves the text content of a specified web element.
@@ -53,20 +101,23 @@ class BrowserWrapper:
 
         Args:
             locator (str): The locator of the button element.
-            timeout (int): The maximum time to wait for the element to be visible. Default is 10 seconds.
+            timeout (int): The maximum time to wait for the element to be visible until the locator's
+                own timeout is learned. Default is 10 seconds.
         """
-        self.browser.wait_until_element_is_visible(locator, timeout=timeout)
+        self._wait_until_visible(locator, timeout)
         self.browser.click_button(locator)
 
-    def click_element_when_visible(self, locator: str, timeout: int = 10) -> None:
+    def click_element_when_visible(self, locator: str, timeout: int = 10, optional: bool = False) -> None:
         """
         Waits until an element is visible and then clicks it.
 
         Args:
             locator (str): The locator of the element.
-            timeout (int): The maximum time to wait for the element to be visible. Default is 10 seconds.
+            timeout (int): The maximum time to wait for the element to be visible until the locator's
+                own timeout is learned. Default is 10 seconds.
+            optional (bool): Whether the element may legitimately never appear, such as a popup.
         """
-        self.browser.wait_until_element_is_visible(locator, timeout=timeout)
+        self._wait_until_visible(locator, timeout, optional)
         self.browser.click_element(locator)
 
     def find_element_when_visible(
@@ -78,12 +129,13 @@ class BrowserWrapper:
         Args:
             locator (str): The locator of the element to find.
             element: The parent element to search within. Default is None.
-            timeout (int): The maximum time to wait for the element to be visible. Default is 10 seconds.
+            timeout (int): The maximum time to wait for the element to be visible until the locator's
+                own timeout is learned. Default is 10 seconds.
 
         Returns:
             WebElement: The found web element.
         """
-        self.browser.wait_until_element_is_visible(locator, timeout=timeout)
+        self._wait_until_visible(locator, timeout)
         return self.browser.find_element(locator, parent=element)
 
     def find_elements_when_visible(self, locator: str, timeout: int = 10) -> list[WebElement]:
@@ -92,12 +144,13 @@ class BrowserWrapper:
 
         Args:
             locator (str): The locator of the elements to find.
-            timeout (int): The maximum time to wait for the elements to be visible. Default is 10 seconds.
+            timeout (int): The maximum time to wait for the elements to be visible until the locator's
+                own timeout is learned. Default is 10 seconds.
 
         Returns:
             list: A list of found web elements.
         """
-        self.browser.wait_until_element_is_visible(locator, timeout=timeout)
+        self._wait_until_visible(locator, timeout)
         return self.browser.find_elements(locator)
 
     def get_image_attribute(self, element: WebElement, attribute: str) -> str:
@@ -119,9 +172,10 @@ class BrowserWrapper:
 
         Args:
             locator (str): The locator of the element.
-            timeout (int): The maximum time to wait for the element to be visible. Default is 10 seconds.
+            timeout (int): The maximum time to wait for the element to be visible until the locator's
+                own timeout is learned. Default is 10 seconds.
         """
-        self.browser.wait_until_element_is_visible(locator, timeout=timeout)
+        self._wait_until_visible(locator, timeout)
 
     def does_page_contain_element(self, locator: str) -> bool:
         """
@@ -141,9 +195,11 @@ class BrowserWrapper:
 
         Args:
             locator (str): The locator of the element.
-            timeout (int): The maximum time to wait for the element to be absent. Default is 10 seconds.
+            timeout (int): The maximum time to wait for the element to be absent until the locator's
+                own timeout is learned. Default is 10 seconds.
         """
-        self.browser.wait_until_page_does_not_contain_element(locator, timeout=timeout)
+        with self.timeouts.wait(f'absent:{locator}', timeout) as adaptive_timeout:
+            self.browser.wait_until_page_does_not_contain_element(locator, timeout=adaptive_timeout)
 
     def enter_text_when_visible_and_submit(self, locator: str, text: str, timeout: int = 10) -> None:
         """
@@ -152,14 +208,15 @@ class BrowserWrapper:
         Args:
             locator (str): The locator of the element.
             text (str): The text to enter into the element.
-            timeout (int): The maximum time to wait for the element to be visible. Default is 10 seconds.
+            timeout (int): The maximum time to wait for the element to be visible until the locator's
+                own timeout is learned. Default is 10 seconds.
         """
-        self.browser.wait_until_element_is_visible(locator, timeout=timeout)
+        self._wait_until_visible(locator, timeout)
         self.browser.input_text(locator, text)
         self.browser.press_keys(locator, Keys.ENTER)
 
     def select_from_list_by_value_when_visible(
-            self, wait_locator: str, select_locator: str, value: str
+            self, wait_locator: str, select_locator: str, value: str, timeout: int = 10
     ) -> None:
         """
         Waits until a list element is visible and selects an option by value.
@@ -168,12 +225,17 @@ class BrowserWrapper:
             wait_locator (str): The locator of the element to wait for.
             select_locator (str): The locator of the list element.
             value (str): The value of the option to select.
+            timeout (int): The maximum time to wait for the element to be visible until the locator's
+                own timeout is learned. Default is 10 seconds.
         """
-        self.browser.wait_until_element_is_visible(wait_locator)
+        self._wait_until_visible(wait_locator, timeout)
         self.browser.select_from_list_by_value(select_locator, value)
 
     def close_browser(self) -> None:
         """
-        Close browser.
+        Close browser and save the latencies observed at each wait site for the next runs.
         """
-        self.browser.close_browser()
+        try:
+            self.browser.close_browser()
+        finally:
+            self.timeouts.save()
@@ -1,23 +1,40 @@
 import traceback
+from datetime import date
 
+from RPA.Robocorp.WorkItems import WorkItems
 from robocorp.tasks import task
 
 from config import RCCWortItems
-from extractors.apnews import ApNews
+from extractors.apnews import ApNews, get_till_date, plan_date_shards, shard_payloads, merge_shard_items
 from logging_config import logger
 
 
+def create_ap_news(work_item: RCCWortItems) -> ApNews:
+    logger.info('Initializing ApNews scrapper')
+    return ApNews(
+        search_phrase=work_item.search_phrase,
+        no_of_months=work_item.no_of_months,
+        category=work_item.category,
+        similarity_threshold=work_item.similarity_threshold,
+        fetch_articles=work_item.fetch_articles,
+        page_cache_ttl=work_item.page_cache_ttl,
+        dataset_dir=work_item.dataset_dir,
+        till_date=work_item.till_date,
+        from_date=work_item.from_date,
+        categories=work_item.categories,
+        image_width=work_item.image_width,
+        image_format=work_item.image_format,
+        image_quality=work_item.image_quality,
+        request_interval=work_item.request_interval
+    )
+
+
 @task
 def new_extraction_task():
     try:
         logger.info('Task Executed')
         work_item = RCCWortItems()
-        logger.info('Initializing ApNews scrapper')
-        ap_news = ApNews(
-            search_phrase=work_item.search_phrase,
-            no_of_months=work_item.no_of_months,
-            category=work_item.category
-        )
+        ap_news = create_ap_news(work_item)
         ap_news.execute_process()
         logger.info('ApNews scrapper process completed.')
     except Exception as e:
@@ -26,3 +43,60 @@ def new_extraction_task():
     finally:
         logger.info('Extraction Task Completed...')
 
+
+@task
+def plan_shards_task():
+    work_items = WorkItems()
+    work_items.get_input_work_item()
+    work_item = RCCWortItems(work_items.get_work_item_payload())
+    till_date = work_item.till_date or get_till_date(work_item.no_of_months)
+    from_date = work_item.from_date or date.today()
+
+    shards = plan_date_shards(till_date, from_date, work_item.shard_days)
+    for payload in shard_payloads(work_item.payload, shards):
+        work_items.create_output_work_item(variables=payload, save=True)
+    logger.info(f'Planned {len(shards)} shards from {till_date} to {from_date}')
+
+
+@task
+def extract_shard_task():
+    work_items = WorkItems()
+
+    def extract_shard():
+        work_item = RCCWortItems(work_items.get_work_item_payload())
+        logger.info(f'Extracting shard from {work_item.till_date} to {work_item.from_date}')
+        try:
+            ap_news = create_ap_news(work_item)
+            ap_news.scrape()
+        except Exception as e:
+            logger.error(f'Shard extraction failed due to {e}')
+            traceback.print_exc()
+            work_items.release_input_work_item("FAILED", exception_type="APPLICATION", message=str(e))
+            return
+        work_items.create_output_work_item(
+            variables={**work_item.payload, "items": [item.model_dump() for item in ap_news.results]},
+            save=True
+        )
+        logger.info(f'Shard extracted {len(ap_news.results)} articles')
+
+    work_items.for_each_input_work_item(extract_shard)
+
+
+@task
+def merge_shards_task():
+    try:
+        work_items = WorkItems()
+        payloads = work_items.for_each_input_work_item(work_items.get_work_item_payload)
+        logger.info(f'Merging {len(payloads)} shards')
+        work_item = RCCWortItems(payloads[0])
+        ap_news = create_ap_news(work_item)
+        ap_news.results = merge_shard_items(payloads)
+        ap_news.news_count = len(ap_news.results)
+        ap_news.export()
+        logger.info('ApNews shards merged.')
+    except Exception as e:
+        logger.error(f'ApNews shard merge failed due to {e}')
+        traceback.print_exc()
+        raise
+    finally:
+        logger.info('Merge Task Completed...')
@@ -0,0 +1,60 @@
+import unittest
+from datetime import date, timedelta
+
+from extractors.apnews.utils import UnsortedResultsError, find_cutoff_page
+
+NEWEST = date(2024, 6, 30)
+
+
+def results(pages: int, cards: int = 10, days_per_card: int = 1) -> dict[int, list[str]]:
+    """
+    Build newest first card dates for a number of results pages.
+    """
+    return {
+        page: [
+            (NEWEST - timedelta(days=((page - 1) * cards + card) * days_per_card)).isoformat()
+            for card in range(cards)
+        ]
+        for page in range(1, pages + 1)
+    }
+
+
+class FindCutoffPageTest(unittest.TestCase):
+
+    def search(self, pages: dict[int, list[str]], till_date: date, failing: tuple = ()) -> tuple:
+        probed = []
+
+        def probe(page: int) -> list[str]:
+            probed.append(page)
+            return [] if page in failing else pages[page]
+
+        return find_cutoff_page(probe, len(pages), till_date), probed
+
+    def test_matches_a_linear_scan(self) -> None:
+        pages = results(100)
+        for days in (0, 5, 9, 10, 11, 137, 500, 999, 2000):
+            till_date = NEWEST - timedelta(days=days)
+            expected = max(page for page, dates in pages.items() if dates[0] >= till_date.isoformat())
+            self.assertEqual(self.search(pages, till_date)[0], expected, days)
+
+    def test_cutoff_on_the_first_page_probes_two_pages(self) -> None:
+        cutoff_page, probed = self.search(results(1000), NEWEST - timedelta(days=5))
+
+        self.assertEqual(cutoff_page, 1)
+        self.assertEqual(probed, [1, 2])
+
+    def test_failed_probe_is_not_reported_as_unsorted(self) -> None:
+        cutoff_page, _ = self.search(results(100), NEWEST - timedelta(days=500), failing=(4,))
+
+        self.assertIsNone(cutoff_page)
+
+    def test_unsorted_results_raise(self) -> None:
+        pages = results(100)
+        pages[2] = list(reversed(pages[2]))
+
+        with self.assertRaises(UnsortedResultsError):
+            self.search(pages, NEWEST - timedelta(days=500))
+
+
+if __name__ == '__main__':
+    unittest.main()
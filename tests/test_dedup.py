@@ -0,0 +1,24 @@
+import unittest
+
+from extractors.apnews.dedup import CANDIDATE_RECALL, SIGNATURE_SIZE, band_rows
+
+
+class BandRowsTest(unittest.TestCase):
+
+    def test_recall_at_the_threshold(self) -> None:
+        for threshold in (0.3, 0.4, 0.5, 0.6, 0.7, 0.8):
+            rows = band_rows(threshold)
+            recall = 1 - (1 - threshold ** rows) ** (SIGNATURE_SIZE // rows)
+
+            self.assertEqual(SIGNATURE_SIZE % rows, 0, threshold)
+            self.assertGreaterEqual(recall, CANDIDATE_RECALL, threshold)
+
+    def test_lower_thresholds_get_narrower_bands(self) -> None:
+        rows = [band_rows(threshold) for threshold in (0.3, 0.4, 0.5, 0.6, 0.7, 0.8)]
+
+        self.assertEqual(rows, sorted(rows))
+        self.assertEqual(rows[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from extractors.apnews.locators import ApNewsLocators
+from extractors.locator import xpath_to_css
+
+
+class XpathToCssTest(unittest.TestCase):
+
+    def test_relative_locator_is_scoped(self) -> None:
+        self.assertEqual(
+            xpath_to_css(ApNewsLocators.TITLE_LOCATOR),
+            ':scope div.PagePromo-title > a.Link > span'
+        )
+
+    def test_absolute_descendant_locator(self) -> None:
+        self.assertEqual(
+            xpath_to_css(ApNewsLocators.RESULTS_LOCATOR),
+            'div.PageList-items > div.PageList-items-item'
+        )
+
+    def test_unsupported_xpaths_are_not_compiled(self) -> None:
+        for xpath in (
+                '//div[contains(@class, "PagePromo")]',
+                '//span[text()="Search"]',
+                '//div[@class="PageList-items"]/..',
+                '/html/body',
+        ):
+            self.assertIsNone(xpath_to_css(xpath), xpath)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from extractors.throttle import HostScheduler
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """
+    Answers 429 while more than `server.capacity` requests are in flight, 200 otherwise.
+    """
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            throttled = server.in_flight > server.capacity
+            server.throttled += throttled
+        try:
+            time.sleep(server.delay)
+            self.send_response(429 if throttled else 200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, capacity: int, delay: float) -> None:
+        super().__init__(('127.0.0.1', 0), ThrottlingHandler)
+        self.capacity = capacity
+        self.delay = delay
+        self.in_flight = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+
+class HostSchedulerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = ThrottlingServer(capacity=4, delay=0.02)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_throttled_requests_are_retried(self) -> None:
+        scheduler = HostScheduler(initial_limit=8, max_limit=32, min_interval=0, cooldown=0.05, max_retries=5)
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            statuses = list(executor.map(lambda _: scheduler.get(self.url, timeout=5).status_code, range(200)))
+
+        self.assertEqual(statuses, [200] * 200)
+        self.assertGreater(self.server.throttled, 0)
+        host = scheduler.metrics()['hosts'][scheduler.host_of(self.url)]
+        self.assertEqual(host['throttled'], self.server.throttled)
+        self.assertLess(host['lowest_limit'], 8)
+
+    def test_last_throttled_response_is_returned_when_retries_run_out(self) -> None:
+        self.server.capacity = 0
+        scheduler = HostScheduler(min_interval=0, cooldown=0.01, max_retries=2)
+
+        self.assertEqual(scheduler.get(self.url, timeout=5).status_code, 429)
+        self.assertEqual(self.server.throttled, 3)
+
+    def test_keyed_slots_are_scheduled_apart(self) -> None:
+        scheduler = HostScheduler(min_interval=0)
+        scheduler.get(self.url, timeout=5)
+        with scheduler.slot(self.url, key='browser:127.0.0.1'):
+            pass
+
+        hosts = scheduler.metrics()['hosts']
+        self.assertEqual(hosts[scheduler.host_of(self.url)]['requests'], 1)
+        self.assertEqual(hosts['browser:127.0.0.1']['requests'], 1)
+
+    def test_failed_requests_count_as_congestion(self) -> None:
+        scheduler = HostScheduler(min_interval=0, cooldown=0)
+        for _ in range(5):
+            with self.assertRaises(requests.ConnectionError):
+                scheduler.get('http://127.0.0.1:1/', timeout=1)
+
+        host = scheduler.metrics()['hosts']['127.0.0.1:1']
+        self.assertEqual(host['errors'], 5)
+        self.assertLessEqual(host['limit'], scheduler.initial_limit)
+        self.assertIsNone(host['latency'])
+
+    def test_timeouts_space_out_the_next_slot(self) -> None:
+        scheduler = HostScheduler(min_interval=0, cooldown=0.3)
+        with self.assertRaises(TimeoutError):
+            with scheduler.slot(self.url, key='browser:127.0.0.1'):
+                raise TimeoutError
+
+        started = time.monotonic()
+        with scheduler.slot(self.url, key='browser:127.0.0.1'):
+            pass
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+
+    def test_requests_are_spaced_by_the_minimum_interval(self) -> None:
+        scheduler = HostScheduler(initial_limit=4, min_interval=0.1)
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: scheduler.get(self.url, timeout=5), range(4)))
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
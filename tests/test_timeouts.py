@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from extractors.timeouts import TimeoutManager
+
+
+class TimeoutManagerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.manager = TimeoutManager(path=os.path.join(self.directory.name, 'timeouts.json'))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_required_site_recovers_after_an_outage(self) -> None:
+        for _ in range(10):
+            self.manager.record('results', 3.0)
+        for _ in range(10):
+            self.manager.record('results', None)
+
+        self.assertEqual(self.manager.timeout('results', 30), 30)
+        self.manager.record('results', 3.0)
+        self.assertEqual(self.manager.timeout('results', 30), 4.5)
+
+    def test_required_site_never_gets_below_its_learned_timeout(self) -> None:
+        for _ in range(5):
+            self.manager.record('results', 3.0)
+        for _ in range(15):
+            self.manager.record('results', None)
+            self.assertGreaterEqual(self.manager.timeout('results', 30), 4.5)
+
+    def test_optional_site_that_keeps_missing_gets_the_floor(self) -> None:
+        for _ in range(10):
+            self.manager.record('popup', None)
+
+        self.assertEqual(self.manager.timeout('popup', 30, optional=True), self.manager.floor)
+        self.assertEqual(self.manager.timeout('popup', 30), 30)
+
+    def test_statistics_survive_a_reload(self) -> None:
+        for _ in range(5):
+            self.manager.record('results', 1.0)
+        self.manager.save()
+
+        reloaded = TimeoutManager(path=self.manager.path)
+        self.assertEqual(reloaded.timeout('results', 30), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()